@@ -1 +1,433 @@
-
+# خلاصه‌سازی استخراجی متن فارسی بر اساس فراوانی کلمات
+# هر جمله فقط یک بار توکن‌سازی می‌شود و به صورت رکورد (اندیس، جمله، کلمات) نگه داشته می‌شود.
+# امتیاز جمله میانگین فراوانی کلمات محتوایی آن است (جمله‌های بلند فقط به خاطر طولشان برنده نمی‌شوند)
+# و جمله‌های انتخاب‌شده به ترتیب اصلی متن برگردانده می‌شوند.
+import heapq
+import re
+from collections import deque
+
+from language import detect_language
+from metrics import default_metrics
+from text_pipeline import default_pipeline
+
+
+# علامت‌های پایان جمله برای بریدن متن در حالت جریانی
+SENTENCE_END = re.compile(r"[.!?؟\n]")
+
+_stopwords = None
+
+
+def persian_stopwords():
+    global _stopwords
+    if _stopwords is None:
+        from hazm import stopwords_list
+        _stopwords = frozenset(stopwords_list())
+    return _stopwords
+
+
+def _is_word(token):
+    return any(ch.isalnum() for ch in token)
+
+
+# کلمات محتوایی یک جمله (بدون علائم نگارشی و در صورت نیاز بدون کلمات ایست)
+def content_words(tokens, stopwords):
+    return [t for t in tokens if _is_word(t) and t not in stopwords]
+
+
+def sentence_score(words, word_freq, normalize_length=True):
+    if not words:
+        return 0.0
+    total = sum(word_freq.get(w, 0) for w in words)
+    return total / len(words) if normalize_length else float(total)
+
+
+# تعداد جمله‌های خلاصه: یا عدد ثابت، یا نسبتی از کل جمله‌ها
+def summary_size(total, sentences=2, ratio=None):
+    if ratio is not None:
+        return max(1, min(total, round(total * ratio)))
+    return min(total, sentences)
+
+
+# تابع خلاصه‌سازی متن فارسی با استفاده از توکن‌سازی و وزن‌دهی به جملات
+@default_metrics.timed('summarize_farsi')
+def summarize_farsi(text, sentences=2, ratio=None, remove_stopwords=True, normalize_length=True):
+    pipeline = default_pipeline
+    metrics = default_metrics
+    stopwords = persian_stopwords() if remove_stopwords else frozenset()
+
+    with metrics.stage('summarize_farsi.normalize'):
+        normalized = pipeline.normalize(text)
+    with metrics.stage('summarize_farsi.sentences'):
+        sents = pipeline.sentence_tokenize(normalized)
+
+    records = []
+    word_freq = {}
+    with metrics.stage('summarize_farsi.tokenize'):
+        for index, sent in enumerate(sents):
+            words = content_words(pipeline.word_tokenize(sent), stopwords)
+            for word in words:
+                word_freq[word] = word_freq.get(word, 0) + 1
+            records.append((index, sent, words))
+
+    n = summary_size(len(records), sentences, ratio)
+    with metrics.stage('summarize_farsi.rank'):
+        best = heapq.nlargest(
+            n, records,
+            key=lambda r: (sentence_score(r[2], word_freq, normalize_length), -r[0]),
+        )
+    best.sort(key=lambda r: r[0])
+    return " ".join(sent for _, sent, _ in best)
+
+
+# خلاصه‌سازی افزایشی متن در حال رشد (گفتگوی زنده، فایل لاگ)
+# تکه‌های متن با feed اضافه می‌شوند و متن در مرز آخرین پایان جمله بریده می‌شود
+# (باقی‌مانده تا تکه بعدی نگه داشته می‌شود). برای هر جمله جدید فقط فراوانی کلماتش
+# به‌روز و در heap بهترین جمله‌ها (candidates تا) قرار داده می‌شود؛ پس هزینه متناسب با
+# تعداد جمله‌های جدید است. فراوانی‌ها فقط روی window جمله آخر حساب می‌شوند و
+# جمله‌های قدیمی‌تر از پنجره حذف می‌شوند، پس حافظه محدود است (window=None یعنی
+# فراوانی روی کل متن، بدون نگه داشتن جمله‌ها). امتیاز جمله‌های قبلی تنبل حساب می‌شود:
+# فقط وقتی تغییر فراوانی‌ها از آخرین امتیازدهی بیشتر از drift برابر مجموع آن‌ها شود،
+# در اولین summary همه جمله‌های پنجره دوباره امتیاز می‌گیرند؛ وگرنه فقط candidates.
+class StreamingSummarizer:
+    # تعداد جمله‌های پنجره و آستانه تغییر فراوانی‌ها برای امتیازدهی دوباره کامل
+    WINDOW = 5000
+    DRIFT = 0.25
+
+    def __init__(self, sentences=2, window=WINDOW, candidates=None, drift=DRIFT,
+                 remove_stopwords=True, normalize_length=True, max_carry=1 << 20):
+        self.sentences = sentences
+        self.window = window
+        self.keep = max(sentences, candidates or sentences * 8)
+        self.drift = drift
+        self.normalize_length = normalize_length
+        self.max_carry = max_carry
+        self.stopwords = persian_stopwords() if remove_stopwords else frozenset()
+
+        self.word_freq = {}
+        self.total = 0            # مجموع فراوانی کلمات داخل پنجره
+        self.changed = 0          # تغییر فراوانی‌ها از آخرین امتیازدهی دوباره کامل
+        self.records = deque()    # (اندیس، جمله، کلمات) جمله‌های داخل پنجره
+        self.heap = []            # (امتیاز، -اندیس، اندیس، جمله، کلمات)
+        self.count = 0
+        self.carry = ""
+        self.rescores = 0
+
+    # اضافه کردن یک تکه متن؛ تعداد جمله‌های کامل جدید برگردانده می‌شود
+    def feed(self, chunk):
+        last = None
+        # باقی‌مانده قبلی پایان جمله ندارد، پس فقط تکه جدید جستجو می‌شود
+        for last in SENTENCE_END.finditer(chunk):
+            pass
+        buffer = self.carry + chunk
+        if last is None:
+            if len(buffer) < self.max_carry:
+                self.carry = buffer
+                return 0
+            cut = len(buffer)
+        else:
+            cut = len(self.carry) + last.end()
+        self.carry = buffer[cut:]
+        return self._process(buffer[:cut])
+
+    # پردازش باقی‌مانده آخر متن (مثلا در پایان فایل)
+    def flush(self):
+        carry, self.carry = self.carry, ""
+        return self._process(carry) if carry.strip() else 0
+
+    def _process(self, raw):
+        pipeline = default_pipeline
+        # تکه‌های متن جریانی تکراری نیستند و در کش نگه داشته نمی‌شوند
+        normalized = pipeline.normalize(raw, cache=False)
+        added = 0
+        for sent in pipeline.sentence_tokenize(normalized, cache=False):
+            if sent.strip():
+                self._add(sent, tuple(content_words(pipeline.word_tokenize(sent, cache=False), self.stopwords)))
+                added += 1
+        return added
+
+    def _add(self, sent, words):
+        index = self.count
+        self.count += 1
+        freq = self.word_freq
+        for word in words:
+            freq[word] = freq.get(word, 0) + 1
+        self.total += len(words)
+        self.changed += len(words)
+        if self.window is not None:
+            self.records.append((index, sent, words))
+            if len(self.records) > self.window:
+                self._evict(self.records.popleft())
+            # جمله‌های بیرون‌رفته از پنجره گاه‌به‌گاه از heap پاک می‌شوند (هزینه سرشکن O(1))
+            if index % self.keep == 0:
+                self._purge()
+
+        item = (sentence_score(words, freq, self.normalize_length), -index, index, sent, words)
+        heap = self.heap
+        if len(heap) < self.keep:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def _evict(self, record):
+        freq = self.word_freq
+        words = record[2]
+        for word in words:
+            left = freq[word] - 1
+            if left:
+                freq[word] = left
+            else:
+                del freq[word]
+        self.total -= len(words)
+        self.changed += len(words)
+
+    # اولین اندیس جمله‌ای که هنوز داخل پنجره است
+    def _start(self):
+        return self.records[0][0] if self.window is not None and self.records else 0
+
+    def _purge(self):
+        start = self._start()
+        if self.heap and min(item[2] for item in self.heap) < start:
+            self.heap = [item for item in self.heap if item[2] >= start]
+            heapq.heapify(self.heap)
+
+    # امتیاز دوباره فقط برای candidates
+    def _rescore_candidates(self):
+        start = self._start()
+        freq, normalize_length = self.word_freq, self.normalize_length
+        self.heap = [
+            (sentence_score(words, freq, normalize_length), neg, index, sent, words)
+            for _, neg, index, sent, words in self.heap if index >= start
+        ]
+        heapq.heapify(self.heap)
+
+    # امتیاز دوباره همه جمله‌های پنجره و انتخاب دوباره candidates
+    def _rescore_window(self):
+        freq, normalize_length = self.word_freq, self.normalize_length
+        self.heap = heapq.nlargest(self.keep, (
+            (sentence_score(words, freq, normalize_length), -index, index, sent, words)
+            for index, sent, words in self.records
+        ))
+        heapq.heapify(self.heap)
+        self.changed = 0
+        self.rescores += 1
+
+    # خلاصه فعلی (جمله‌های کامل تا این لحظه، به ترتیب متن)
+    def summary(self, sentences=None):
+        if self.window is not None and self.changed > self.drift * max(self.total, 1):
+            self._rescore_window()
+        else:
+            self._rescore_candidates()
+        best = heapq.nlargest(sentences or self.sentences, self.heap)
+        best.sort(key=lambda item: item[2])
+        return " ".join(item[3] for item in best)
+
+    def stats(self):
+        return {
+            'sentences': self.count,
+            'window': len(self.records),
+            'vocabulary': len(self.word_freq),
+            'candidates': len(self.heap),
+            'carry': len(self.carry),
+            'rescores': self.rescores,
+        }
+
+
+# خلاصه‌سازی جریانی برای متن‌های خیلی بزرگ با حافظه محدود
+# chunks هر iterable از رشته‌هاست (مثلا یک فایل باز یا تکه‌های خوانده‌شده از آن).
+# فراوانی کلمات روی کل متن حساب می‌شود و فقط candidates جمله با بهترین امتیاز
+# نگه داشته می‌شوند؛ امتیاز آن‌ها بعد از هر تکه با فراوانی‌های جدید دوباره حساب می‌شود.
+def summarize_farsi_stream(chunks, sentences=2, remove_stopwords=True, normalize_length=True,
+                           candidates=None, max_carry=1 << 20):
+    summarizer = StreamingSummarizer(sentences, None, candidates, remove_stopwords=remove_stopwords,
+                                     normalize_length=normalize_length, max_carry=max_carry)
+    for chunk in chunks:
+        if summarizer.feed(chunk):
+            summarizer._rescore_candidates()
+    summarizer.flush()
+    return summarizer.summary()
+
+
+# خواندن یک فایل بزرگ به صورت تکه‌تکه برای summarize_farsi_stream
+def read_chunks(path, chunk_size=1 << 16):
+    with open(path, 'r', encoding='utf-8') as f:
+        for chunk in iter(lambda: f.read(chunk_size), ''):
+            yield chunk
+
+
+# ---------------------------------------------------------------------------
+# TextRank: گراف شباهت جمله‌ها به صورت ماتریس اسپارس و رتبه‌بندی با power iteration
+# شباهت دو جمله مثل مقاله اصلی TextRank است: تعداد کلمات مشترک تقسیم بر
+# log(طول جمله اول) + log(طول جمله دوم). برای متن‌های خیلی بلند فقط جمله‌هایی که
+# حداکثر window جمله با هم فاصله دارند به هم وصل می‌شوند تا گراف خطی بماند.
+
+# بیشترین تعداد جمله‌ای که گراف کامل برایشان ساخته می‌شود
+FULL_GRAPH_LIMIT = 2000
+# فاصله همسایگی در گراف پنجره‌ای
+DEFAULT_WINDOW = 100
+
+ENGLISH_SENTENCE = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+ENGLISH_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+ENGLISH_STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just me more most
+my myself no nor not now of off on once only or other our ours ourselves out over own same she
+should so some such than that the their theirs them themselves then there these they this those
+through to too under until up very was we were what when where which while who whom why will with
+would you your yours yourself yourselves s t don
+""".split())
+
+
+# ماتریس سطر-کلمه (باینری) برای لیست کلمات هر جمله
+def _term_matrix(token_lists):
+    import numpy as np
+    from scipy.sparse import csr_matrix
+
+    vocab = {}
+    indptr = [0]
+    indices = []
+    for words in token_lists:
+        cols = {vocab.setdefault(w, len(vocab)) for w in words}
+        indices.extend(cols)
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float64)
+    return csr_matrix((data, indices, indptr), shape=(len(token_lists), max(len(vocab), 1)))
+
+
+# ماتریس شباهت اسپارس جمله‌ها (بدون قطر اصلی)
+def similarity_graph(token_lists, window=None):
+    import numpy as np
+    from scipy.sparse import coo_matrix, triu
+
+    n = len(token_lists)
+    X = _term_matrix(token_lists)
+    log_len = np.log1p(np.asarray(X.sum(axis=1)).ravel())
+
+    if window is None:
+        overlap = triu(X @ X.T, k=1).tocoo()
+        rows, cols, common = overlap.row, overlap.col, overlap.data
+    else:
+        # فقط جفت‌های (i, i+d) برای d <= window؛ هزینه متناسب با n * window است
+        rows, cols, common = [], [], []
+        for d in range(1, min(window, n - 1) + 1):
+            shared = np.asarray(X[:-d].multiply(X[d:]).sum(axis=1)).ravel()
+            nz = np.flatnonzero(shared)
+            rows.append(nz)
+            cols.append(nz + d)
+            common.append(shared[nz])
+        if rows:
+            rows, cols, common = np.concatenate(rows), np.concatenate(cols), np.concatenate(common)
+        else:
+            rows = cols = np.zeros(0, dtype=np.int64)
+            common = np.zeros(0)
+
+    weights = common / (log_len[rows] + log_len[cols])
+    graph = coo_matrix((weights, (rows, cols)), shape=(n, n))
+    return (graph + graph.T).tocsr()
+
+
+# رتبه‌بندی گره‌ها با power iteration تا وقتی تغییر امتیازها از tol کمتر شود
+def pagerank(graph, damping=0.85, tol=1e-6, max_iter=100):
+    import numpy as np
+    from scipy.sparse import diags
+
+    n = graph.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    out_degree = np.asarray(graph.sum(axis=1)).ravel()
+    dangling = out_degree == 0
+    inv = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+    transition = (diags(inv) @ graph).T.tocsr()
+
+    ranks = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        leaked = ranks[dangling].sum() / n
+        new = (1.0 - damping) / n + damping * (transition @ ranks + leaked)
+        if np.abs(new - ranks).sum() < tol:
+            return new
+        ranks = new
+    return ranks
+
+
+# انتخاب n جمله برتر با TextRank، به ترتیب متن اصلی
+def textrank(sentences, token_lists, n=2, window=None, max_sentences=None):
+    if max_sentences is not None and len(sentences) > max_sentences:
+        sentences = sentences[:max_sentences]
+        token_lists = token_lists[:max_sentences]
+    if not sentences:
+        return []
+    if window is None and len(sentences) > FULL_GRAPH_LIMIT:
+        window = DEFAULT_WINDOW
+
+    with default_metrics.stage('textrank.graph'):
+        graph = similarity_graph(token_lists, window)
+    with default_metrics.stage('textrank.pagerank'):
+        ranks = pagerank(graph)
+    best = heapq.nlargest(min(n, len(sentences)), range(len(sentences)), key=lambda i: (ranks[i], -i))
+    return [sentences[i] for i in sorted(best)]
+
+
+def split_english(text):
+    return [s.strip() for s in ENGLISH_SENTENCE.split(text.strip()) if s.strip()]
+
+
+def english_words(sentence):
+    return [w for w in ENGLISH_WORD.findall(sentence.lower()) if w not in ENGLISH_STOPWORDS]
+
+
+# خلاصه‌سازی TextRank متن فارسی با همان موتور متن انگلیسی
+@default_metrics.timed('summarize_farsi_textrank')
+def summarize_farsi_textrank(text, sentences=2, ratio=None, window=None, max_sentences=None):
+    pipeline = default_pipeline
+    stopwords = persian_stopwords()
+
+    sents = pipeline.sentences(text)
+    token_lists = [content_words(pipeline.word_tokenize(s), stopwords) for s in sents]
+    n = summary_size(len(sents), sentences, ratio)
+    return " ".join(textrank(sents, token_lists, n, window, max_sentences))
+
+
+# تابع خلاصه‌سازی متن انگلیسی با الگوریتم TextRank
+# backend='sumy' پیاده‌سازی قبلی (sumy) را برای مقایسه کیفیت اجرا می‌کند
+@default_metrics.timed('summarize_english')
+def summarize_english(text, sentences=2, ratio=None, window=None, max_sentences=None, backend='native'):
+    if backend == 'sumy':
+        return summarize_english_sumy(text, sentences)
+    if backend != 'native':
+        raise ValueError(f"unknown summarizer backend: {backend}")
+
+    with default_metrics.stage('summarize_english.split'):
+        sents = split_english(text)
+    with default_metrics.stage('summarize_english.tokenize'):
+        token_lists = [english_words(s) for s in sents]
+    n = summary_size(len(sents), sentences, ratio)
+    return " ".join(textrank(sents, token_lists, n, window, max_sentences))
+
+
+def summarize_english_sumy(text, sentences=2):
+    from sumy.parsers.plaintext import PlaintextParser
+    from sumy.nlp.tokenizers import Tokenizer as SumyTokenizer
+    from sumy.summarizers.text_rank import TextRankSummarizer
+
+    parser = PlaintextParser.from_string(text, SumyTokenizer("english"))
+    summarizer = TextRankSummarizer()
+    summary = summarizer(parser.document, sentences)
+    return " ".join([str(sentence) for sentence in summary])
+
+
+# روش خلاصه‌سازی متن فارسی در summarize_auto (متن انگلیسی همیشه با TextRank خلاصه می‌شود)
+FARSI_METHODS = {'frequency': summarize_farsi, 'textrank': summarize_farsi_textrank}
+
+
+# خلاصه‌سازی با تشخیص خودکار زبان؛ (کد زبان، خلاصه) یا (کد زبان، None) برای زبان پشتیبانی‌نشده
+def summarize_auto(text, sentences=2, method='frequency'):
+    if method not in FARSI_METHODS:
+        raise ValueError(f"unknown summarization method: {method}")
+    with default_metrics.stage('language.detect'):
+        lang = detect_language(text)
+    if lang == 'fa':
+        return lang, FARSI_METHODS[method](text, sentences)
+    if lang == 'en':
+        return lang, summarize_english(text, sentences)
+    return lang, None
@@ -0,0 +1 @@
+# بنچمارک‌های سرعت UnderFeel (هر ماژول با python -m benchmarks.<name> اجرا می‌شود)
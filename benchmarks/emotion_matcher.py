@@ -0,0 +1,101 @@
+# بنچمارک پیدا کردن کلمات احساسی: ماشین Aho-Corasick در برابر حلقه قدیمی روی توکن‌ها
+# برای هر اندازه دیتاست، زمان ساخت ماشین، تعداد جمله در ثانیه و تعداد کلمات پیدا شده
+# (مجموع وزن کلمات) گزارش می‌شود. بخشی از کلمات دیتاست در جمله‌ها با پسوند/پیشوند صرفی می‌آیند تا
+# تفاوت دو روش در پیدا کردن شکل‌های صرفی هم دیده شود.
+#
+#   python -m benchmarks.emotion_matcher --sizes 2000 50000 --sentences 5000
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks import generators
+
+
+INFLECTIONS = ('ها', 'های', 'م', 'ش', 'تر', 'هایشان')
+PREFIXES = ('می', 'نمی')
+ZWNJ = '\u200c'
+
+
+# جمله‌های مصنوعی؛ نسبتی از کلمات احساسی صرف شده‌اند
+def make_sentences(rows, count, inflected_ratio=0.3, seed=0):
+    rng = random.Random(seed)
+    sentences = []
+    for sentence in generators.make_sentences(rows, count, seed=seed):
+        words = sentence.split()
+        for i, word in enumerate(words):
+            if rng.random() < inflected_ratio:
+                if rng.random() < 0.8:
+                    words[i] = word + ZWNJ + rng.choice(INFLECTIONS)
+                else:
+                    words[i] = rng.choice(PREFIXES) + ZWNJ + word
+        sentences.append(" ".join(words))
+    return sentences
+
+
+def throughput(fn, inputs):
+    start = time.perf_counter()
+    matched = 0.0
+    for text in inputs:
+        matched += sum(fn(text).values())
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "sentences_per_s": len(inputs) / elapsed, "matched": round(matched)}
+
+
+def bench(size, sentences, workdir, seed):
+    from emotion import EMOTIONS, EmotionClassifier
+    from emotion_matcher import EmotionMatcher
+
+    path = os.path.join(workdir, f"lexicon_{size}.csv")
+    rows = generators.write_lexicon(path, size, seed=seed)
+    classifier = EmotionClassifier(path, path + ".cache", matcher='tokens')
+
+    start = time.perf_counter()
+    matcher = EmotionMatcher(classifier.lexicon, EMOTIONS)
+    build = time.perf_counter() - start
+
+    # نرمال‌سازی برای هر دو روش یکسان است و جزو اندازه‌گیری نیست
+    inputs = [classifier.normalize(text, cache=False) for text in make_sentences(rows, sentences, seed=seed)]
+    tokenize = classifier.pipeline.word_tokenize
+    tokens = throughput(lambda text: classifier.score_tokens(tokenize(text, cache=False)), inputs)
+    automaton = throughput(matcher.score, inputs)
+    return {
+        "lexicon": size,
+        "states": len(matcher.fail),
+        "build_s": build,
+        "tokens": tokens,
+        "automaton": automaton,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the emotion word matcher.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 50_000],
+                        help="lexicon sizes (rows)")
+    parser.add_argument("--sentences", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    from text_pipeline import default_pipeline
+
+    # گرم کردن hazm تا زمان ساختن اجزای آن در اندازه‌گیری‌ها نباشد
+    default_pipeline._components()
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            row = bench(size, args.sentences, workdir, args.seed)
+            results.append(row)
+            if not args.json:
+                print(f"{size:>8} words  build {row['build_s'] * 1000:7.1f} ms ({row['states']} states)  " + "  ".join(
+                    f"{name}: {row[name]['sentences_per_s']:9.0f} sent/s, {row[name]['matched']} matched"
+                    for name in ("tokens", "automaton")))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
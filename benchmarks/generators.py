@@ -0,0 +1,112 @@
+# تولید داده مصنوعی تکرارپذیر برای بنچمارک‌ها
+# پایگاه دانش (سوال و جواب فارسی/انگلیسی)، دیتاست احساسات و متن فارسی/انگلیسی.
+# با seed یکسان همیشه همان داده ساخته می‌شود.
+import csv
+import json
+import random
+
+from emotion import EMOTIONS
+
+
+PERSIAN_LETTERS = "ابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی"
+ENGLISH_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+PERSIAN_WORDS = (
+    "سلام خوبی امروز هوا دانشگاه درس کتاب استاد دانشجو سوال جواب برنامه کامپیوتر "
+    "پایتون یادگیری ماشین هوش مصنوعی زبان فارسی متن خلاصه احساس شادی غم عشق "
+    "نفرت کار خانه شهر تهران ایران دوست خانواده غذا ورزش فیلم موسیقی سفر"
+).split()
+ENGLISH_WORDS = (
+    "hello how are you what is the a python machine learning artificial intelligence "
+    "language text summary emotion happy sad love hate work home city friend family "
+    "food sport movie music travel university student teacher question answer"
+).split()
+
+
+def _random_word(rng, letters, low=3, high=8):
+    return "".join(rng.choice(letters) for _ in range(rng.randint(low, high)))
+
+
+# یک سوال: ترکیبی از کلمات رایج و چند کلمه تصادفی (تا سوال‌ها یکتا باشند)
+def _question(rng, persian):
+    words = PERSIAN_WORDS if persian else ENGLISH_WORDS
+    letters = PERSIAN_LETTERS if persian else ENGLISH_LETTERS
+    parts = [rng.choice(words) for _ in range(rng.randint(2, 5))]
+    parts += [_random_word(rng, letters) for _ in range(rng.randint(1, 3))]
+    rng.shuffle(parts)
+    return " ".join(parts)
+
+
+# پایگاه دانش با size سوال به فرمت data.json
+def make_knowledge_base(size, persian_ratio=0.5, seed=0):
+    rng = random.Random(seed)
+    questions = []
+    for i in range(size):
+        persian = rng.random() < persian_ratio
+        questions.append({
+            'question': _question(rng, persian),
+            'answer': f"{'پاسخ' if persian else 'answer'} {i}",
+        })
+    return {'questions': questions}
+
+
+def write_knowledge_base(path, size, persian_ratio=0.5, seed=0):
+    data = make_knowledge_base(size, persian_ratio, seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return data
+
+
+# دیتاست احساسات با size سطر (کلمه، احساس)؛ بخشی از کلمات چند برچسبی هستند
+def make_lexicon(size, multi_label_ratio=0.05, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    words = set()
+    while len(rows) < size:
+        word = _random_word(rng, PERSIAN_LETTERS, 3, 9)
+        if word in words:
+            continue
+        words.add(word)
+        rows.append((word, rng.choice(EMOTIONS)))
+        if rng.random() < multi_label_ratio and len(rows) < size:
+            rows.append((word, rng.choice(EMOTIONS)))
+    return rows
+
+
+def write_lexicon(path, size, multi_label_ratio=0.05, seed=0):
+    rows = make_lexicon(size, multi_label_ratio, seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['word', 'emotion'])
+        writer.writerows(rows)
+    return rows
+
+
+# جمله‌هایی که بخشی از کلماتشان از دیتاست احساسات است
+def make_sentences(lexicon_rows, count, words_per_sentence=12, hit_ratio=0.2, seed=0):
+    rng = random.Random(seed)
+    lexicon_words = [word for word, _ in lexicon_rows]
+    sentences = []
+    for _ in range(count):
+        words = [
+            rng.choice(lexicon_words) if rng.random() < hit_ratio else rng.choice(PERSIAN_WORDS)
+            for _ in range(words_per_sentence)
+        ]
+        sentences.append(" ".join(words))
+    return sentences
+
+
+# متن با اندازه تقریبی size بایت (UTF-8) برای خلاصه‌سازی
+def make_document(size, persian=True, seed=0):
+    rng = random.Random(seed)
+    words = PERSIAN_WORDS if persian else ENGLISH_WORDS
+    parts = []
+    length = 0
+    while length < size:
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(6, 18)))
+        if not persian:
+            sentence = sentence.capitalize()
+        sentence += "."
+        parts.append(sentence)
+        length += len(sentence.encode('utf-8')) + 1
+    return " ".join(parts)
@@ -0,0 +1,121 @@
+# تولید بار برای سرور HTTP (python chatbot.py --serve)
+# چند اتصال keep-alive همزمان درخواست می‌فرستند و در آخر p50/p99 تاخیر و
+# تعداد درخواست در ثانیه برای هر endpoint گزارش می‌شود.
+#
+#   python -m benchmarks.loadgen --url http://127.0.0.1:8080 --concurrency 32 --duration 10
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.parse import urlsplit
+
+
+REQUESTS = {
+    'respond': ["سلام", "hello bot", "how are you?", "what is AI?", "سلام چطوری", "یک سوال ناشناخته"],
+    'emotion': ["من امروز خیلی خوشحال و مسرور هستم", "از این وضعیت ناراحت و غمگین هستم",
+                "I feel glad and hopeful", "نگرانی و وسواس دارم"],
+    'summarize': [
+        "امروز هوا آفتابی است. مردم در پارک قدم می‌زنند. دانشگاه تعطیل است. هوا خوب است.",
+        "Python is a programming language. It is used in data science. "
+        "Data science uses Python. Cats are nice.",
+    ],
+}
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+async def request(reader, writer, host, path, payload):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def client(url, endpoints, deadline, latencies, errors, rng):
+    parts = urlsplit(url)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    try:
+        while time.perf_counter() < deadline:
+            endpoint = rng.choice(endpoints)
+            payload = {'text': rng.choice(REQUESTS[endpoint])}
+            start = time.perf_counter()
+            status = await request(reader, writer, parts.netloc, '/' + endpoint, payload)
+            if status == 200:
+                latencies[endpoint].append(time.perf_counter() - start)
+            else:
+                errors[endpoint] += 1
+    finally:
+        writer.close()
+
+
+async def run(url, endpoints, concurrency, duration, seed):
+    latencies = {e: [] for e in endpoints}
+    errors = {e: 0 for e in endpoints}
+    start = time.perf_counter()
+    deadline = start + duration
+    rng = random.Random(seed)
+    await asyncio.gather(*(
+        client(url, endpoints, deadline, latencies, errors, random.Random(rng.random()))
+        for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    report = {}
+    for endpoint in endpoints:
+        values = latencies[endpoint]
+        report[endpoint] = {
+            'requests': len(values),
+            'errors': errors[endpoint],
+            'rps': len(values) / elapsed,
+            'p50_ms': percentile(values, 50) * 1000,
+            'p99_ms': percentile(values, 99) * 1000,
+        }
+    every = [v for values in latencies.values() for v in values]
+    report['total'] = {
+        'requests': len(every),
+        'errors': sum(errors.values()),
+        'rps': len(every) / elapsed,
+        'p50_ms': percentile(every, 50) * 1000,
+        'p99_ms': percentile(every, 99) * 1000,
+    }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for the UnderFeel HTTP server.")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--endpoints", nargs="+", default=sorted(REQUESTS), choices=sorted(REQUESTS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args.url, args.endpoints, args.concurrency, args.duration, args.seed))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return report
+    for name, row in report.items():
+        print(f"{name:>10}: {row['requests']:7d} req  {row['errors']:5d} err  {row['rps']:9.1f} req/s  "
+              f"p50 {row['p50_ms']:8.2f} ms  p99 {row['p99_ms']:8.2f} ms")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# بنچمارک زمان شروع برنامه: زمان import ماژول chatbot و زمان تا نمایش اولین پنجره
+# هر اجرا در یک پروسس تازه انجام می‌شود تا کش ماژول‌ها اثری نداشته باشد. پایگاه دانش،
+# دیتاست احساسات و تاریخچه گفتگو از یک پوشه موقت خوانده و نوشته می‌شوند تا فایلی
+# (ژورنال، قفل، ایندکس تاریخچه، کش دیتاست) در پوشه برنامه ساخته نشود.
+#
+#   python -m benchmarks.startup --runs 5
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import chatbot
+from chat_ui import ChatUI
+t1 = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv[:1])
+bot = chatbot.ChatBot(chatbot.DATA_PATH)
+window = ChatUI(bot)
+window.show()
+app.processEvents()
+t2 = time.perf_counter()
+heavy = [m for m in ("hazm", "sumy", "langdetect", "pandas", "numpy", "scipy") if m in sys.modules]
+print(json.dumps({"import": t1 - t0, "first_window": t2 - t0, "loaded": heavy}))
+"""
+
+
+# یک اجرای کامل در پروسس جدا؛ زمان کل شامل بالا آمدن مفسر پایتون هم هست
+def run_once(env):
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=REPO_DIR, env=env,
+                         capture_output=True, text=True, check=True)
+    total = time.perf_counter() - start
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["process_to_window"] = total
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure chatbot import time and time-to-first-window.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, var in (("data.json", "UNDERFEEL_DATA"), ("emotion_dataset.csv", "UNDERFEEL_EMOTIONS")):
+            env[var] = os.path.join(workdir, name)
+            shutil.copyfile(os.path.join(REPO_DIR, name), env[var])
+        env["UNDERFEEL_HISTORY"] = os.path.join(workdir, "chat_history.jsonl")
+        runs = [run_once(env) for _ in range(args.runs)]
+
+    summary = {
+        key: {"median": statistics.median(r[key] for r in runs), "min": min(r[key] for r in runs)}
+        for key in ("import", "first_window", "process_to_window")
+    }
+    summary["loaded_at_first_window"] = runs[-1]["loaded"]
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return summary
+
+    for key in ("import", "first_window", "process_to_window"):
+        print(f"{key:>18}: median {summary[key]['median'] * 1000:8.1f} ms   min {summary[key]['min'] * 1000:8.1f} ms")
+    print(f"{'heavy modules':>18}: {', '.join(summary['loaded_at_first_window']) or '-'}")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+# مجموعه بنچمارک تکرارپذیر روی داده مصنوعی
+# زمان پاسخ چت‌بات (دقیق، جزئی، کلمات مشترک، ناموفق)، یادگیری و ذخیره، امتیازدهی
+# احساسات و خلاصه‌سازی فارسی/انگلیسی را در اندازه‌های مختلف اندازه می‌گیرد،
+# نتیجه را در یک فایل JSON می‌نویسد و در صورت داشتن baseline پسرفت‌ها را گزارش می‌کند.
+#
+#   python -m benchmarks.suite --preset quick -o bench_results.json
+#   python -m benchmarks.suite --preset quick --baseline bench_results.json --threshold 0.25
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks import generators
+
+
+PRESETS = {
+    'quick': {'kb': [1_000, 10_000], 'lexicon': [2_000, 20_000], 'docs': [1_000, 100_000]},
+    'full': {
+        'kb': [1_000, 10_000, 100_000, 1_000_000],
+        'lexicon': [2_000, 50_000, 500_000],
+        'docs': [1_000, 100_000, 1_000_000, 10_000_000],
+    },
+}
+
+
+# زمان هر بار اجرای fn روی ورودی‌ها (میلی‌ثانیه)
+def measure(fn, inputs):
+    times = []
+    for item in inputs:
+        start = time.perf_counter()
+        fn(item)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return {
+        'ops': len(times),
+        'median_ms': statistics.median(times),
+        'mean_ms': statistics.fmean(times),
+        'min_ms': times[0],
+        'p95_ms': times[min(len(times) - 1, int(len(times) * 0.95))],
+    }
+
+
+def measure_once(fn):
+    return measure(lambda _: fn(), [None])
+
+
+# ---------------------------------------------------------------- چت‌بات
+
+def _queries(questions, count, rng):
+    exact, substring, overlap = [], [], []
+    for q in rng.sample(questions, min(count, len(questions))):
+        text = q['question']
+        exact.append(text)
+        middle = len(text) // 2
+        substring.append(text[max(0, middle - 6):middle + 6].strip() or text)
+        words = text.split()
+        if len(set(words)) >= 3:
+            picked = rng.sample(sorted(set(words)), 3)
+            overlap.append(" ".join(picked + ["نامربوط"]))
+    miss = [
+        " ".join(generators._random_word(rng, "qxzjvw", 4, 7) for _ in range(3))
+        for _ in range(count)
+    ]
+    return {'exact': exact, 'substring': substring, 'overlap': overlap, 'miss': miss}
+
+
+def bench_chatbot(results, size, workdir, queries, learns, seed):
+    from chat_core import ChatBot
+    from question_index import FuzzyIndex
+
+    path = os.path.join(workdir, f"kb_{size}.json")
+    data = generators.write_knowledge_base(path, size, seed=seed)
+    tag = f"[kb={size}]"
+
+    bot = None
+
+    def load():
+        nonlocal bot
+        bot = ChatBot(path)
+
+    results[f"chatbot.load{tag}"] = measure_once(load)
+    # ایندکس فازی در warm_up ساخته می‌شود (نه در سازنده) تا جستجوها زمان ساخت را نشان ندهند
+    results[f"chatbot.warm_up{tag}"] = measure_once(bot.warm_up)
+    results[f"chatbot.fuzzy_build{tag}"] = measure_once(lambda: FuzzyIndex(keys=bot.index.keys).warm_up())
+
+    rng = random.Random(seed)
+    for kind, inputs in _queries(data['questions'], queries, rng).items():
+        results[f"get_response.{kind}{tag}"] = measure(bot.get_response, inputs)
+
+    pairs = [(f"سوال جدید {i} {seed}", f"جواب {i}") for i in range(learns)]
+    results[f"learn_new_answer{tag}"] = measure(lambda p: bot.learn_new_answer(*p), pairs)
+
+    # جستجوی فازی بلافاصله بعد از هر یادگیری (ماتریس اصلی نباید دوباره ساخته شود)
+    def learn_then_miss(i):
+        bot.learn_new_answer(f"پرسش دیگر {i} {seed}", "جواب")
+        bot.fuzzy_index.search(f"پرسش دیگری {i}", k=1)
+
+    results[f"fuzzy.search_after_learn{tag}"] = measure(learn_then_miss, range(learns))
+    results[f"save_data{tag}"] = measure_once(bot.save_data)
+    bot.close()
+
+
+# ---------------------------------------------------------------- احساسات
+
+def bench_emotion(results, size, workdir, sentences, seed):
+    from emotion import EmotionClassifier
+    from text_pipeline import default_pipeline
+
+    # ساخت اجزای hazm جزو زمان کامپایل دیتاست حساب نشود
+    default_pipeline._components()
+    path = os.path.join(workdir, f"lexicon_{size}.csv")
+    cache = path + ".cache"
+    rows = generators.write_lexicon(path, size, seed=seed)
+    tag = f"[lexicon={size}]"
+
+    results[f"emotion.compile{tag}"] = measure_once(lambda: EmotionClassifier(path, cache))
+    classifier = None
+
+    def load_cached():
+        nonlocal classifier
+        classifier = EmotionClassifier(path, cache)
+
+    results[f"emotion.load_cached{tag}"] = measure_once(load_cached)
+    inputs = generators.make_sentences(rows, sentences, seed=seed)
+
+    # هر روش با کش‌های خالی نرمال‌سازی و توکن‌سازی اندازه گرفته می‌شود
+    def score_cold(scorer):
+        default_pipeline.normalize_cache.clear()
+        default_pipeline.token_cache.clear()
+        return measure(scorer.score, inputs)
+
+    results[f"emotion.score{tag}"] = score_cold(classifier)
+    # روش قدیمی (فقط توکن‌های دقیق) برای مقایسه با ماشین Aho-Corasick
+    results[f"emotion.score_tokens{tag}"] = score_cold(EmotionClassifier(path, cache, matcher='tokens'))
+
+
+# ---------------------------------------------------------------- خلاصه‌سازی
+
+def bench_summarize(results, size, seed):
+    from Summary import summarize_english, summarize_farsi
+    from text_pipeline import default_pipeline
+
+    farsi = generators.make_document(size, persian=True, seed=seed)
+    english = generators.make_document(size, persian=False, seed=seed)
+    repeat = 5 if size <= 100_000 else 1
+
+    def farsi_uncached(text):
+        # هر اجرا بدون کش تا زمان واقعی نرمال‌سازی اندازه گرفته شود
+        for cache in (default_pipeline.normalize_cache, default_pipeline.sentence_cache,
+                      default_pipeline.token_cache):
+            cache.clear()
+        summarize_farsi(text)
+
+    results[f"summarize_farsi[doc={size}]"] = measure(farsi_uncached, [farsi] * repeat)
+    results[f"summarize_english[doc={size}]"] = measure(summarize_english, [english] * repeat)
+
+
+# ---------------------------------------------------------------- مقایسه با baseline
+
+def _threshold_for(name, default, overrides):
+    best = None
+    for prefix, value in overrides.items():
+        if name.startswith(prefix) and (best is None or len(prefix) > len(best[0])):
+            best = (prefix, value)
+    return best[1] if best else default
+
+
+# مقایسه میانه زمان‌ها؛ نتیجه‌هایی که بیش از آستانه کندتر شده‌اند پسرفت هستند
+def compare(results, baseline, threshold=0.25, overrides=None):
+    overrides = overrides or {}
+    rows = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None or previous['median_ms'] <= 0:
+            continue
+        ratio = current['median_ms'] / previous['median_ms']
+        limit = _threshold_for(name, threshold, overrides)
+        rows.append({
+            'name': name,
+            'baseline_ms': previous['median_ms'],
+            'current_ms': current['median_ms'],
+            'ratio': ratio,
+            'threshold': limit,
+            'regression': ratio > 1 + limit,
+        })
+    return rows
+
+
+def run(preset='quick', kb_sizes=None, lexicon_sizes=None, doc_sizes=None,
+        queries=200, learns=50, sentences=1000, seed=0, only=None):
+    sizes = PRESETS[preset]
+    kb_sizes = kb_sizes or sizes['kb']
+    lexicon_sizes = lexicon_sizes or sizes['lexicon']
+    doc_sizes = doc_sizes or sizes['docs']
+    only = set(only or ('chatbot', 'emotion', 'summarize'))
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="underfeel-bench-") as workdir:
+        if 'chatbot' in only:
+            for size in kb_sizes:
+                bench_chatbot(results, size, workdir, queries, learns, seed)
+        if 'emotion' in only:
+            for size in lexicon_sizes:
+                bench_emotion(results, size, workdir, sentences, seed)
+        if 'summarize' in only:
+            for size in doc_sizes:
+                bench_summarize(results, size, seed)
+    return results
+
+
+def _parse_overrides(items):
+    overrides = {}
+    for item in items or []:
+        name, _, value = item.partition("=")
+        overrides[name] = float(value)
+    return overrides
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="UnderFeel benchmark suite on synthetic data.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--kb-sizes", type=int, nargs="+")
+    parser.add_argument("--lexicon-sizes", type=int, nargs="+")
+    parser.add_argument("--doc-sizes", type=int, nargs="+", help="document sizes in bytes")
+    parser.add_argument("--only", nargs="+", choices=["chatbot", "emotion", "summarize"])
+    parser.add_argument("--queries", type=int, default=200, help="queries per match tier")
+    parser.add_argument("--learns", type=int, default=50)
+    parser.add_argument("--sentences", type=int, default=1000, help="sentences for emotion scoring")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown of the median (0.25 = 25%%)")
+    parser.add_argument("--threshold-for", action="append", metavar="PREFIX=VALUE",
+                        help="per-benchmark threshold, e.g. summarize_farsi=0.5")
+    args = parser.parse_args(argv)
+
+    results = run(args.preset, args.kb_sizes, args.lexicon_sizes, args.doc_sizes,
+                  args.queries, args.learns, args.sentences, args.seed, args.only)
+    report = {
+        'meta': {
+            'preset': args.preset,
+            'seed': args.seed,
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'results': results,
+    }
+
+    for name, row in sorted(results.items()):
+        print(f"{name:<45} {row['ops']:6d} ops  median {row['median_ms']:10.3f} ms  p95 {row['p95_ms']:10.3f} ms")
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        comparison = compare(results, baseline, args.threshold, _parse_overrides(args.threshold_for))
+        report['comparison'] = comparison
+        print()
+        for row in comparison:
+            flag = "REGRESSION" if row['regression'] else "ok"
+            print(f"{row['name']:<45} {row['baseline_ms']:10.3f} -> {row['current_ms']:10.3f} ms  "
+                  f"x{row['ratio']:.2f}  {flag}")
+        if any(row['regression'] for row in comparison):
+            exit_code = 1
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# بنچمارک TextRank داخلی در برابر sumy (پیاده‌سازی مرجع) روی متن انگلیسی
+# علاوه بر زمان، تعداد جمله‌های مشترک دو خلاصه هم برای مقایسه کیفیت گزارش می‌شود.
+#
+#   python -m benchmarks.summarize_english --sentences 100 1000 5000
+import argparse
+import json
+import random
+import time
+
+from Summary import split_english, summarize_english
+
+
+WORDS = (
+    "python data science language model graph rank sentence text summary learning network "
+    "university student research paper result method analysis system user question answer"
+).split()
+
+
+# متن انگلیسی مصنوعی با count جمله
+def make_document(count, seed=0):
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(6, 18))]
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare native TextRank with sumy.")
+    parser.add_argument("--sentences", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--summary", type=int, default=5, help="sentences per summary")
+    parser.add_argument("--sumy-limit", type=int, default=2000,
+                        help="skip sumy above this many sentences (it is quadratic)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = []
+    for count in args.sentences:
+        text = make_document(count)
+        native, native_time = timed(summarize_english, text, args.summary)
+        row = {"sentences": count, "native_seconds": native_time,
+               "sumy_seconds": None, "common_sentences": None}
+        if count <= args.sumy_limit:
+            try:
+                reference, sumy_time = timed(summarize_english, text, args.summary, backend="sumy")
+            except LookupError as e:
+                # داده‌های NLTK که sumy لازم دارد نصب نیست
+                row["sumy_error"] = str(e).strip().splitlines()[0]
+            else:
+                row["sumy_seconds"] = sumy_time
+                row["common_sentences"] = len(set(split_english(native)) & set(split_english(reference)))
+        results.append(row)
+        if not args.json:
+            sumy = f"{row['sumy_seconds'] * 1000:9.1f} ms" if row["sumy_seconds"] is not None else "      -     "
+            common = row["common_sentences"] if row["common_sentences"] is not None else "-"
+            print(f"{count:>7} sentences  native {native_time * 1000:9.1f} ms  sumy {sumy}  "
+                  f"common {common}/{args.summary}")
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# بنچمارک خلاصه‌ساز فارسی: نسخه قدیمی (دو بار توکن‌سازی) در برابر نسخه جدید و حالت جریانی
+# rolling: گرفتن خلاصه بعد از هر تکه متن در حال رشد با StreamingSummarizer، در برابر
+# خلاصه‌سازی دوباره کل متن تا آن لحظه (فقط برای اندازه‌های کوچک، چون درجه دو است)
+#
+#   python -m benchmarks.summarize_farsi --sizes 10000 100000 1000000
+import argparse
+import heapq
+import json
+import os
+import random
+import time
+import tracemalloc
+
+from Summary import StreamingSummarizer, read_chunks, summarize_farsi, summarize_farsi_stream
+
+
+SENTENCES = [
+    "امروز هوا آفتابی است و مردم در پارک قدم می‌زنند",
+    "دانشگاه تهران یکی از قدیمی‌ترین دانشگاه‌های ایران است",
+    "یادگیری ماشین شاخه‌ای از هوش مصنوعی است",
+    "کتاب خواندن باعث افزایش دانش و آرامش ذهن می‌شود",
+    "پردازش زبان طبیعی به کامپیوتر کمک می‌کند زبان انسان را بفهمد",
+    "خلاصه‌سازی متن بخش‌های مهم یک نوشته را پیدا می‌کند",
+    "ورزش منظم برای سلامت جسم و روح مفید است",
+    "این پروژه یک چت‌بات فارسی با تحلیل احساسات است",
+]
+
+
+# ساخت یک متن فارسی مصنوعی با اندازه تقریبی size کاراکتر
+def make_document(size, seed=0):
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        words = rng.choice(SENTENCES).split()
+        rng.shuffle(words)
+        sent = " ".join(words) + "."
+        parts.append(sent)
+        length += len(sent) + 1
+    return " ".join(parts)
+
+
+# پیاده‌سازی قبلی summarize_farsi برای مقایسه
+def summarize_farsi_legacy(text):
+    from hazm import Normalizer, SentenceTokenizer, WordTokenizer
+
+    normalizer = Normalizer()
+    text = normalizer.normalize(text)
+
+    sent_tokenizer = SentenceTokenizer()
+    word_tokenizer = WordTokenizer()
+
+    sentences = sent_tokenizer.tokenize(text)
+    word_freq = {}
+
+    for sent in sentences:
+        words = word_tokenizer.tokenize(sent)
+        for word in words:
+            word_freq[word] = word_freq.get(word, 0) + 1
+
+    sentence_scores = {}
+    for sent in sentences:
+        for word in word_tokenizer.tokenize(sent):
+            if word in word_freq:
+                sentence_scores[sent] = sentence_scores.get(sent, 0) + word_freq[word]
+
+    summary_sentences = heapq.nlargest(2, sentence_scores, key=sentence_scores.get)
+    return " ".join(summary_sentences)
+
+
+# خلاصه بعد از هر تکه با خلاصه‌ساز افزایشی
+def rolling_incremental(text, chunk_size, window):
+    summarizer = StreamingSummarizer(window=window)
+    for i in range(0, len(text), chunk_size):
+        summarizer.feed(text[i:i + chunk_size])
+        summarizer.summary()
+
+
+# خلاصه بعد از هر تکه با خلاصه‌سازی دوباره کل متن (بدون کش pipeline)
+def rolling_recompute(text, chunk_size):
+    from text_pipeline import default_pipeline
+
+    for i in range(0, len(text), chunk_size):
+        summarize_farsi(text[:i + chunk_size])
+        default_pipeline.normalize_cache.clear()
+        default_pipeline.token_cache.clear()
+
+
+# زمان و بیشترین حافظه مصرفی یک تابع (حافظه در یک اجرای جدا، چون tracemalloc کند است)
+def measure(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_mb": peak / 2**20}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Persian summarizer.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="document sizes in characters")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="chunk size for the rolling summaries")
+    parser.add_argument("--window", type=int, default=StreamingSummarizer.WINDOW,
+                        help="sentences kept by the rolling summarizer")
+    parser.add_argument("--recompute-limit", type=int, default=100_000,
+                        help="largest size for which the from-scratch rolling baseline runs")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    # گرم کردن hazm تا زمان ساختن اجزای آن در اندازه‌گیری‌ها نباشد
+    summarize_farsi("گرم کردن.")
+    summarize_farsi_legacy("گرم کردن.")
+    results = []
+    for size in args.sizes:
+        text = make_document(size)
+        path = f".bench_farsi_{size}.txt"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        try:
+            row = {
+                "size": size,
+                "legacy": measure(summarize_farsi_legacy, text),
+                "single_pass": measure(summarize_farsi, text),
+                "stream": measure(lambda: summarize_farsi_stream(read_chunks(path))),
+                "rolling": measure(rolling_incremental, text, args.chunk_size, args.window),
+            }
+            if size <= args.recompute_limit:
+                row["rolling_recompute"] = measure(rolling_recompute, text, args.chunk_size)
+        finally:
+            os.remove(path)
+        results.append(row)
+        if not args.json:
+            print(f"{size:>10} chars  " + "  ".join(
+                f"{name}: {row[name]['seconds'] * 1000:8.1f} ms / {row[name]['peak_mb']:6.1f} MB"
+                for name in ("legacy", "single_pass", "stream", "rolling", "rolling_recompute") if name in row))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
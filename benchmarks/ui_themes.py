@@ -0,0 +1,111 @@
+# بنچمارک رابط کاربری (بدون نمایشگر): زمان اولین نمایش پنجره و تعویض تم با تاریخچه بزرگ
+# registry: تعویض تم با property و polish دوباره ویجت‌های قابل دیدن (روش فعلی)
+# stylesheet: نصب دوباره stylesheet تم روی پنجره با هر تعویض (روش قبلی)
+#
+#   python -m benchmarks.ui_themes --history 100000 --rounds 5
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+
+def write_history(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            role, align = ('user', 'right') if i % 2 else ('bot', 'left')
+            f.write(json.dumps({'time': 0.0, 'role': role, 'text': f"پیام شماره {i} در گفتگو", 'align': align},
+                               ensure_ascii=False) + "\n")
+
+
+def summarize(times):
+    times = sorted(times)
+    return {
+        'ops': len(times),
+        'median_ms': statistics.median(times),
+        'p95_ms': times[min(len(times) - 1, int(len(times) * 0.95))],
+        'max_ms': times[-1],
+    }
+
+
+# زمان از شروع تعویض تا کشیده شدن پنجره
+def switch_times(app, window, switch, rounds):
+    from theme_registry import default_themes
+
+    times = []
+    for _ in range(rounds):
+        for name in default_themes.names():
+            start = time.perf_counter()
+            switch(name)
+            app.processEvents()
+            window.repaint()
+            times.append((time.perf_counter() - start) * 1000)
+    return summarize(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark first paint and theme switching offscreen.")
+    parser.add_argument("--history", type=int, default=100_000, help="messages in the chat transcript")
+    parser.add_argument("--rounds", type=int, default=5, help="passes over all themes")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication(sys.argv[:1])
+    from chat_core import ChatBot
+    from chat_ui import ChatUI
+    from theme_registry import default_themes
+    from transcript import TranscriptLog
+
+    results = {'history': args.history}
+    with tempfile.TemporaryDirectory() as workdir:
+        history = os.path.join(workdir, "chat_history.jsonl")
+        write_history(history, args.history)
+        data = os.path.join(workdir, "data.json")
+        with open(data, 'w', encoding='utf-8') as f:
+            json.dump({'questions': []}, f)
+        # ساخت offset ها و ایندکس جستجو جزو زمان نمایش حساب نشود
+        TranscriptLog(history).close()
+        transcript = TranscriptLog(history)
+        bot = ChatBot(data)
+
+        start = time.perf_counter()
+        default_themes.load()
+        results['theme_load_ms'] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        window = ChatUI(bot, transcript)
+        window.resize(600, 700)
+        window.show()
+        app.processEvents()
+        window.repaint()
+        results['first_paint_ms'] = (time.perf_counter() - start) * 1000
+
+        results['registry'] = switch_times(app, window, window.change_theme, args.rounds)
+
+        sheets = {name: default_themes.theme_stylesheet(name, scope=default_themes.scope)
+                  for name in default_themes.names()}
+        results['stylesheet'] = switch_times(app, window, lambda name: window.setStyleSheet(sheets[name]), args.rounds)
+
+        window.close()
+        transcript.close()
+        bot.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"history {args.history} messages  theme load {results['theme_load_ms']:.1f} ms  "
+              f"first paint {results['first_paint_ms']:.1f} ms")
+        for name in ('registry', 'stylesheet'):
+            row = results[name]
+            print(f"  switch ({name:>10}): median {row['median_ms']:6.2f} ms  p95 {row['p95_ms']:6.2f} ms  "
+                  f"max {row['max_ms']:6.2f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    main()
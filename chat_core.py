@@ -0,0 +1,313 @@
+# منطق چت‌بات بدون رابط گرافیکی: ChatBot و کارهای مشترک پنجره و سرور HTTP
+# (دسته‌بند احساسات، خلاصه‌سازی برای نمایش، زیر نظر گرفتن فایل‌ها و گرم کردن).
+# این ماژول PyQt6 را وارد نمی‌کند تا python chatbot.py --serve روی سرور بدون
+# رابط گرافیکی هم اجرا شود.
+import os
+import threading
+
+# ایندکس سوالات برای تطبیق سریع
+from question_index import QuestionIndex, FuzzyIndex, normalize_question
+
+# کش پاسخ‌ها (با هر یادگیری یا بارگذاری دوباره باطل می‌شود)
+from response_cache import ResponseCache, MISS
+
+# ذخیره‌سازی پایگاه دانش با ژورنال
+from storage import JournaledStore
+
+# دسته‌بندی احساسات
+from emotion import EmotionClassifier
+
+# خلاصه‌سازی متن فارسی و انگلیسی (زبان اول بر اساس خط و در صورت ابهام با langdetect تشخیص داده می‌شود)
+from Summary import summarize_auto, summarize_farsi, summarize_english
+
+# زمان‌سنجی مراحل (با UNDERFEEL_METRICS=1 یا --metrics روشن می‌شود)
+from metrics import default_metrics
+
+# بارگذاری دوباره فایل‌های داده بعد از تغییر
+from file_watch import FileWatcher
+
+# مسیر فایل‌های داده (با متغیر محیطی یا آرگومان --data و --emotions قابل تغییر است)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.environ.get("UNDERFEEL_DATA", os.path.join(BASE_DIR, "data.json"))
+EMOTION_DATASET_PATH = os.environ.get("UNDERFEEL_EMOTIONS", os.path.join(BASE_DIR, "emotion_dataset.csv"))
+HISTORY_PATH = os.environ.get("UNDERFEEL_HISTORY", os.path.join(BASE_DIR, "chat_history.jsonl"))
+# روش پیدا کردن کلمات احساسی (آرگومان --matcher)
+EMOTION_MATCHER = 'automaton'
+
+_emotion_classifier = None
+_emotion_lock = threading.Lock()
+
+
+# بارگذاری دیتاست احساسات در اولین استفاده (یک بار کامپایل و روی دیسک کش می‌شود)
+def get_emotion_classifier():
+    global _emotion_classifier
+    with _emotion_lock:
+        if _emotion_classifier is None:
+            _emotion_classifier = EmotionClassifier(EMOTION_DATASET_PATH, matcher=EMOTION_MATCHER)
+        return _emotion_classifier
+
+
+# ساخت دوباره دسته‌بند احساسات بعد از تغییر دیتاست؛ نسخه جدید کنار نسخه فعلی ساخته
+# و بعد جایگزین می‌شود تا درخواست‌های در حال اجرا منتظر نمانند
+def reload_emotion_classifier():
+    global _emotion_classifier
+    if _emotion_classifier is None:
+        # هنوز بارگذاری نشده؛ اولین استفاده فایل جدید را می‌خواند
+        return
+    classifier = EmotionClassifier(EMOTION_DATASET_PATH, matcher=EMOTION_MATCHER)
+    with _emotion_lock:
+        _emotion_classifier = classifier
+    default_metrics.inc('reload', file='emotions', kind='full')
+
+
+# زیر نظر گرفتن پایگاه دانش، ژورنال آن و دیتاست احساسات
+def watch_files(bot, interval=FileWatcher.INTERVAL):
+    watcher = FileWatcher(interval)
+    watcher.watch(bot.store.data_path, lambda _: bot.refresh())
+    watcher.watch(bot.store.journal_path, lambda _: bot.refresh())
+    watcher.watch(EMOTION_DATASET_PATH, lambda _: reload_emotion_classifier())
+    return watcher.start()
+
+
+# گرم کردن کتابخانه‌ها و داده‌ها در پس‌زمینه بعد از نمایش پنجره
+def warm_up(bot):
+    bot.warm_up()
+
+    # ساخت اجزای hazm و بارگذاری پروفایل‌های langdetect در اولین فراخوانی انجام می‌شود
+    get_emotion_classifier().classify("گرم کردن")
+    summarize_farsi("گرم کردن.")
+    summarize_english("Warm up. Warm up again.")
+    from langdetect import detect
+    detect("warm up")
+
+
+# نام مرحله زمان‌سنجی هر قانون تطبیق
+TIER_STAGES = {
+    'exact': 'get_response.exact',
+    'substring': 'get_response.substring',
+    'common_words': 'get_response.common_words',
+}
+
+
+# تعریف کلاس چت‌بات
+class ChatBot:
+    # حداقل امتیاز شباهت برای پاسخ فازی (None یعنی جستجوی فازی خاموش است)
+    FUZZY_THRESHOLD = 0.5
+
+    def __init__(self, data_path, fuzzy_threshold=FUZZY_THRESHOLD, cache=None):
+        self.data_path = data_path
+        self.store = JournaledStore(data_path)
+        self.fuzzy_threshold = fuzzy_threshold
+        self.cache = ResponseCache() if cache is None else cache
+        # فقط یک نویسنده (یادگیری، ذخیره، بارگذاری دوباره) در هر لحظه؛ خواننده‌ها قفل نمی‌گیرند
+        self.lock = threading.RLock()
+        # (پایگاه دانش، ایندکس، ایندکس فازی) با یک انتساب عوض می‌شوند تا خواننده‌ها
+        # هیچ وقت ایندکس جدید را کنار داده قدیمی نبینند
+        self.view = None
+        self.rebuild_index(self.load_data())
+
+    @property
+    def kb(self):
+        return self.view[0]
+
+    @property
+    def index(self):
+        return self.view[1]
+
+    @property
+    def fuzzy_index(self):
+        return self.view[2]
+
+    # نمای {"questions": [...]} پایگاه دانش (برای خروجی گرفتن؛ هر بار ساخته می‌شود)
+    @property
+    def data(self):
+        return self.kb.to_dict()
+
+    # ساخت ایندکس سوالات و ایندکس فازی یک بار هنگام بارگذاری
+    # (اگر اسنپ‌شات باینری باشد هر دو ایندکس از فایل خوانده و فقط سوال‌های ژورنال اضافه می‌شوند)
+    # ماتریس ایندکس فازی در اولین استفاده ساخته می‌شود (FuzzyIndex.warm_up)
+    def rebuild_index(self, kb=None):
+        kb = self.kb if kb is None else kb
+        sections = kb.sections or {}
+        index = QuestionIndex(sections=sections if 'index.keys.data' in sections else None)
+        for i in range(len(index), len(kb)):
+            index.add(kb.question(i))
+        if 'fuzzy.indptr' in sections:
+            fuzzy_index = FuzzyIndex(sections=sections)
+            for i in range(len(fuzzy_index), len(kb)):
+                fuzzy_index.add(kb.question(i))
+        else:
+            fuzzy_index = FuzzyIndex(keys=index.keys)
+        # در بارگذاری دوباره، ماتریس فازی پیش از جایگزینی ساخته می‌شود تا جستجوی بعدی منتظر
+        # نماند؛ بار اول در warm_up (پس‌زمینه، بعد از نمایش پنجره) ساخته می‌شود
+        if self.view is not None:
+            fuzzy_index.warm_up()
+        self.view = (kb, index, fuzzy_index)
+        self.cache.bump()
+
+    # جایگزینی با پایگاه دانش تازه خوانده‌شده از دیسک. اگر فقط سوال به انتهای پایگاه دانش
+    # فعلی اضافه شده باشد (فشرده‌سازی پروسس دیگر) ایندکس‌های فعلی نگه داشته و فقط سوال‌های
+    # جدید به آن‌ها اضافه می‌شوند؛ وگرنه ایندکس‌ها پیش از جایگزینی کامل ساخته می‌شوند
+    def replace_kb(self, kb):
+        current = self.view
+        if current is None or (kb.sections and 'index.keys.data' in kb.sections) or not kb.extends(current[0]):
+            self.rebuild_index(kb)
+            return
+        _, index, fuzzy_index = current
+        # پایگاه دانش اول عوض می‌شود تا ایندکس هیچ وقت اندیسی بیرون از آن برنگرداند
+        self.view = (kb, index, fuzzy_index)
+        for i in range(len(index), len(kb)):
+            index.add(kb.question(i))
+            fuzzy_index.add(kb.question(i))
+        self.cache.bump()
+
+    # بارگذاری دوباره کامل پایگاه دانش از دیسک (ساخت کنار نسخه فعلی و جایگزینی اتمیک)
+    def reload(self):
+        with self.lock:
+            self.replace_kb(self.load_data())
+        default_metrics.inc('reload', file='knowledge_base', kind='full')
+
+    # آماده کردن ایندکس فازی و مسیر پاسخ‌دهی پیش از اولین درخواست
+    def warm_up(self):
+        self.fuzzy_index.warm_up()
+        self.match("گرم کردن")
+
+    # هم‌گام شدن با تغییرات دیسک (پروسس‌های دیگر یا ویرایش فایل)؛ اگر فقط به ژورنال
+    # اضافه شده باشد همان رکوردها اضافه می‌شوند، وگرنه کل پایگاه دانش دوباره خوانده می‌شود.
+    # تعداد رکوردهای اضافه‌شده یا None برای بارگذاری کامل
+    def refresh(self):
+        with self.lock:
+            with self.store.locked(shared=True):
+                records = self.store.changes()
+            if records is None:
+                self.reload()
+            elif records:
+                self._apply(records)
+                default_metrics.inc('reload', file='knowledge_base', kind='incremental')
+            return None if records is None else len(records)
+
+    def _apply(self, records):
+        kb, index, fuzzy_index = self.view
+        for record in records:
+            if record.get('op') == 'learn':
+                kb.append(record['question'], record['answer'])
+                index.add(record['question'])
+                fuzzy_index.add(record['question'])
+        self.cache.bump()
+
+    # بارگذاری داده‌های سوال و جواب از فایل JSON یا باینری
+    # (اسنپ‌شات data.json به همراه بازپخش ژورنال پاسخ‌های جدید)
+    def load_data(self):
+        return self.store.load()
+
+    # ذخیره داده‌های یادگرفته‌شده در فایل
+    # (کل داده در data.json نوشته می‌شود و ژورنال خالی می‌شود؛ پیش از آن یادگیری‌های
+    # پروسس‌های دیگر زیر همان قفل اضافه می‌شوند تا گم نشوند)
+    def save_data(self):
+        with default_metrics.request('save_data'), self.lock, self.store.locked():
+            records = self.store.changes()
+            if records is None:
+                self.replace_kb(self.load_data())
+            elif records:
+                self._apply(records)
+            # سوال‌های یادگرفته‌شده در ماتریس اصلی ایندکس فازی ادغام می‌شوند
+            self.fuzzy_index.compact()
+            self.store.write_snapshot(self.kb, self.index, self.fuzzy_index)
+
+    # پاسخ دادن به سوال کاربر با تطبیق سوالات قبلی
+    # (دقیق، سپس جزئی، سپس حداقل سه کلمه مشترک؛ همه از طریق ایندکس)
+    # و در آخر نزدیک‌ترین سوال با جستجوی فازی
+    # (پاسخ‌های تکراری، حتی «بلد نیستم»، از کش برگردانده می‌شوند)
+    def get_response(self, user_input: str) -> str:
+        key = normalize_question(user_input)
+        answer = self.cache.get(key)
+        metrics = default_metrics
+        if answer is not MISS:
+            metrics.inc('response_cache', result='hit')
+            return answer
+
+        generation = self.cache.generation
+        if not metrics.enabled and metrics.profile_kind is None:
+            answer = self.match(user_input)[0]
+        else:
+            with metrics.request('get_response'):
+                answer, tier = self.match(user_input, timed=True)
+            metrics.inc('response_cache', result='miss')
+            metrics.inc('match_tier', tier=tier or 'miss')
+        self.cache.put(key, answer, generation)
+        return answer
+
+    # (پاسخ، نام قانونی که جواب داد)؛ با timed=True هر قانون جدا زمان‌سنجی می‌شود
+    def match(self, user_input, timed=False):
+        kb, index, fuzzy_index = self.view
+        if not len(kb):
+            return None, None
+
+        if timed:
+            idx = tier = None
+            for name, find in index.tiers():
+                with default_metrics.stage(TIER_STAGES[name]):
+                    idx = find(user_input)
+                if idx is not None:
+                    tier = name
+                    break
+        else:
+            idx, tier = index.lookup_tier(user_input)
+        if idx is not None:
+            return kb.answer(idx), tier
+
+        if self.fuzzy_threshold is not None:
+            with default_metrics.stage('get_response.fuzzy'):
+                matches = fuzzy_index.search(user_input, k=1, threshold=self.fuzzy_threshold)
+            if matches:
+                return kb.answer(matches[0][0]), 'fuzzy'
+        return None, None
+
+    # k سوال شبیه به متن کاربر به همراه پاسخ و امتیاز شباهت
+    def get_close_questions(self, user_input: str, k=5, threshold=None):
+        if threshold is None:
+            threshold = self.fuzzy_threshold or 0.0
+        kb, _, fuzzy_index = self.view
+        return [
+            (kb.question(idx), kb.answer(idx), score)
+            for idx, score in fuzzy_index.search(user_input, k=k, threshold=threshold)
+        ]
+
+    # یادگیری پاسخ جدید در صورت بلد نبودن
+    # (یادگیری‌های پروسس‌های دیگر که پیش از این در ژورنال آمده‌اند هم به همان ترتیب اضافه می‌شوند)
+    def learn_new_answer(self, question: str, answer: str):
+        record = {'op': 'learn', 'question': question, 'answer': answer}
+        with self.lock:
+            # فقط یک خط به ژورنال اضافه می‌شود؛ بازنویسی کامل فایل گاه‌به‌گاه انجام می‌شود
+            with default_metrics.stage('learn.journal'):
+                records = self.store.append(record)
+            if records is None:
+                self.replace_kb(self.load_data())
+            else:
+                self._apply(records + [record])
+            if self.store.needs_compaction():
+                self.save_data()
+
+    # بستن ژورنال هنگام خروج از برنامه
+    def close(self):
+        self.store.release()
+
+
+# خلاصه‌سازی متن بر اساس زبان شناسایی‌شده (متن نهایی برای نمایش)
+@default_metrics.timed('summarize_text', request=True)
+def summarize_for_display(text):
+    lang, summary = summarize_auto(text)
+    if lang == 'fa':
+        return "📌 زبان: فارسی\n\n" + summary
+    elif lang == 'en':
+        return "📌 Language: English\n\n" + summary
+    return "⛔️ زبان پشتیبانی نمی‌شود."
+
+
+# احساس غالب یک متن برای تب تحلیل احساسات
+@default_metrics.timed('analyze_sentiment', request=True)
+def classify_emotion(text):
+    with default_metrics.stage('analyze_sentiment.load'):
+        classifier = get_emotion_classifier()
+    with default_metrics.stage('analyze_sentiment.classify'):
+        return classifier.classify(text)
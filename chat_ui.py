@@ -0,0 +1,502 @@
+# رابط گرافیکی برنامه (PyQt6): پنجره چت، خلاصه‌سازی و تحلیل احساسات
+import json
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout,
+    QLineEdit, QPushButton, QLabel, QListView, QTabWidget,
+    QMessageBox, QTextEdit, QInputDialog, QAbstractItemView
+)
+from PyQt6.QtGui import QFont
+from PyQt6.QtCore import (
+    Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal,
+    QAbstractListModel, QModelIndex
+)
+
+from chat_core import ChatBot, HISTORY_PATH, summarize_for_display, classify_emotion
+
+# تاریخچه گفتگو روی دیسک
+from transcript import TranscriptLog
+
+# تم‌های رنگی (فایل‌های پوشه themes، یک بار خوانده می‌شوند)
+from theme_registry import default_themes, DEFAULT_THEME
+
+
+# سیگنال‌های کار پس‌زمینه (QRunnable خودش QObject نیست)
+class WorkerSignals(QObject):
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)
+
+
+# اجرای یک تابع در QThreadPool و برگرداندن نتیجه با سیگنال به رشته اصلی
+class Worker(QRunnable):
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+        self.setAutoDelete(False)
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.error.emit(e)
+        else:
+            self.signals.result.emit(result)
+
+
+# مدل لیست چت روی تاریخچه دیسکی
+# فقط پنجره‌ای از پیام‌ها (حداکثر WINDOW ردیف) در مدل است؛ با رسیدن اسکرول به بالا
+# یا پایین لیست، پیام‌های قبلی یا بعدی از TranscriptLog خوانده و از آن طرف پنجره
+# حذف می‌شوند. پس چیدن لیست و حافظه به طول گفتگو بستگی ندارد.
+class TranscriptModel(QAbstractListModel):
+    WINDOW = 400
+    ALIGNMENTS = {
+        'right': Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+        'left': Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+    }
+
+    def __init__(self, log, parent=None, window=WINDOW):
+        super().__init__(parent)
+        self.log = log
+        self.window = window
+        self.page = max(1, window // 4)
+        self.stop = len(log)
+        self.start = max(0, self.stop - window)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.stop - self.start
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.log.get(self.start + index.row())['text']
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            message = self.log.get(self.start + index.row())
+            return self.ALIGNMENTS.get(message.get('align'), self.ALIGNMENTS['left'])
+        return None
+
+    def at_end(self):
+        return self.stop == len(self.log)
+
+    # اضافه کردن پیام به انتهای تاریخچه (پنجره به انتهای گفتگو می‌رود)
+    def append(self, text, align, role):
+        if not self.at_end():
+            self.log.append(text, role, align=align)
+            self.move_to(len(self.log) - 1)
+            return
+        row = self.stop - self.start
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.log.append(text, role, align=align)
+        self.stop += 1
+        self.endInsertRows()
+        self._trim_top()
+
+    # خواندن پیام‌های قدیمی‌تر به بالای پنجره؛ تعداد ردیف‌های اضافه‌شده
+    def load_older(self):
+        count = min(self.page, self.start)
+        if count:
+            self.beginInsertRows(QModelIndex(), 0, count - 1)
+            self.start -= count
+            self.endInsertRows()
+            excess = self.stop - self.start - self.window
+            if excess > 0:
+                first = self.stop - self.start - excess
+                self.beginRemoveRows(QModelIndex(), first, first + excess - 1)
+                self.stop -= excess
+                self.endRemoveRows()
+        return count
+
+    # خواندن پیام‌های جدیدتر به پایین پنجره؛ تعداد ردیف‌های حذف‌شده از بالا
+    def load_newer(self):
+        count = min(self.page, len(self.log) - self.stop)
+        if not count:
+            return 0
+        row = self.stop - self.start
+        self.beginInsertRows(QModelIndex(), row, row + count - 1)
+        self.stop += count
+        self.endInsertRows()
+        return self._trim_top()
+
+    def _trim_top(self):
+        excess = self.stop - self.start - self.window
+        if excess <= 0:
+            return 0
+        self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+        self.start += excess
+        self.endRemoveRows()
+        return excess
+
+    # جابه‌جا کردن پنجره دور پیام شماره position؛ ردیف آن پیام در مدل
+    def move_to(self, position):
+        self.beginResetModel()
+        total = len(self.log)
+        self.start = max(0, min(position - self.window // 2, total - self.window))
+        self.stop = min(total, self.start + self.window)
+        self.endResetModel()
+        return position - self.start
+
+
+# رابط کاربری برنامه با استفاده از PyQt6
+class ChatUI(QWidget):
+    def __init__(self, bot: ChatBot, transcript=None):
+        super().__init__()
+        self.bot = bot
+        self.transcript = transcript if transcript is not None else TranscriptLog(HISTORY_PATH)
+        self.search_query = None
+        self.search_results = []
+        self.search_pos = 0
+        self.scroll_pending = False
+        # کارهای سنگین (خلاصه‌سازی و تحلیل احساسات) در پس‌زمینه اجرا می‌شوند
+        self.thread_pool = QThreadPool.globalInstance()
+        # کارهای چت‌بات به ترتیب و یکی‌یکی اجرا می‌شوند تا پاسخ‌ها جابه‌جا نشوند
+        # و یادگیری همزمان با جستجو در پایگاه دانش انجام نشود
+        self.chat_pool = QThreadPool(self)
+        self.chat_pool.setMaxThreadCount(1)
+        self.jobs = {}          # نوع کار -> آخرین کار (کارهای قبلی همان نوع کنار گذاشته می‌شوند)
+        self.workers = set()    # نگه داشتن ارجاع کارهای در حال اجرا
+        self.chat_pending = 0
+        self.setWindowTitle("UnderFeel")
+        self.setMinimumSize(500, 600)
+        self.selected_theme = self.load_last_theme()
+        # صفحه‌های تبی که بعد از آخرین تعویض تم هنوز polish نشده‌اند
+        self.stale_tabs = set()
+        # stylesheet همه تم‌ها فقط یک بار نصب می‌شود؛ تم فعلی با property انتخاب می‌شود
+        self.setProperty("theme", self.selected_theme)
+        self.init_ui()
+        self.setStyleSheet(default_themes.stylesheet)
+
+    # بارگذاری آخرین تم
+    def load_last_theme(self):
+        try:
+            with open("settings.json", "r", encoding="utf-8") as f:
+                settings = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return DEFAULT_THEME
+        theme = settings.get("theme", DEFAULT_THEME)
+        return theme if theme in default_themes else DEFAULT_THEME
+
+    # تغییر تم
+    def change_theme(self, theme_name):
+        self.selected_theme = theme_name
+        self.apply_theme(theme_name)
+
+    # ذخیره تم با تایید کاربر
+    def save_theme_with_confirm(self):
+        msg_box = QMessageBox(self)
+        msg_box.setWindowTitle("تایید ذخیره تم")
+        msg_box.setText(f"آیا می‌خواهید تم رنگی '{self.selected_theme}' ذخیره شود؟")
+        msg_box.setStandardButtons(QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Cancel)
+        ret = msg_box.exec()
+
+        if ret == QMessageBox.StandardButton.Save:
+            settings = {"theme": self.selected_theme}
+            with open("settings.json", "w", encoding="utf-8") as f:
+                json.dump(settings, f, ensure_ascii=False, indent=2)
+            QMessageBox.information(self, "ذخیره شد", f"تم '{self.selected_theme}' ذخیره شد!")
+      
+    # تابع تغییر تم‌ها
+    # stylesheet دوباره parse نمی‌شود: فقط property پنجره عوض می‌شود و ویجت‌های
+    # قابل دیدن دوباره polish می‌شوند؛ صفحه‌های دیگر تب‌ها هنگام باز شدن (show_tab)
+    def apply_theme(self, theme_name):
+        if theme_name not in default_themes:
+            return
+        self.setProperty("theme", theme_name)
+        self.stale_tabs = set(range(self.tabs.count()))
+        self.stale_tabs.discard(self.tabs.currentIndex())
+        self.repolish(self, visible_only=True)
+
+    # ریشه آخر polish می‌شود؛ اگر پنجره اصلی قبل از فرزندانش polish شود Qt آن را دو بار می‌کشد
+    def repolish(self, root, visible_only=False):
+        style = root.style()
+        for widget in [*root.findChildren(QWidget), root]:
+            if visible_only and not widget.isVisible():
+                continue
+            style.unpolish(widget)
+            style.polish(widget)
+        root.update()
+
+    def show_tab(self, index):
+        if index in self.stale_tabs:
+            self.stale_tabs.discard(index)
+            self.repolish(self.tabs.widget(index))
+
+    # ساخت رابط کاربری اصلی شامل چهار تب
+    def init_ui(self):
+        main_layout = QVBoxLayout(self)
+        self.tabs = tabs = QTabWidget()
+
+        # تب اول: چت‌بات
+        tab1 = QWidget()
+        tab1_layout = QVBoxLayout(tab1)
+        self.header = QLabel("💬 چت با UnderFeel Bot")
+        self.header.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.header.setFont(QFont("Arial", 18, QFont.Weight.Bold))
+        #header.setStyleSheet("color: #d63384; margin-bottom: 10px;")
+        #tab1_layout.addWidget(header)
+        tab1_layout.addWidget(self.header)
+        self.header.setObjectName("header")
+
+        # جستجو در تاریخچه گفتگو (Enter دوباره = نتیجه قدیمی‌تر بعدی)
+        search_layout = QHBoxLayout()
+        self.history_search = QLineEdit()
+        self.history_search.setPlaceholderText("🔍 جستجو در تاریخچه گفتگو...")
+        self.history_search.returnPressed.connect(self.search_history)
+        self.search_status = QLabel("")
+        search_layout.addWidget(self.history_search)
+        search_layout.addWidget(self.search_status)
+        tab1_layout.addLayout(search_layout)
+
+        self.chat_model = TranscriptModel(self.transcript, self)
+        self.chat_area = QListView()
+        self.chat_area.setModel(self.chat_model)
+        # همه ردیف‌ها هم‌اندازه‌اند تا لیست بدون اندازه‌گیری تک‌تک پیام‌ها چیده شود
+        self.chat_area.setUniformItemSizes(True)
+        self.chat_area.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.chat_area.verticalScrollBar().valueChanged.connect(self.page_history)
+        self.chat_area.scrollToBottom()
+        tab1_layout.addWidget(self.chat_area)
+
+        input_layout = QHBoxLayout()
+        self.input_field = QLineEdit()
+        self.send_button = QPushButton("ارسال")
+        input_layout.addWidget(self.input_field)
+        input_layout.addWidget(self.send_button)
+        tab1_layout.addLayout(input_layout)
+        self.send_button.clicked.connect(self.handle_user_input)
+
+        # تب دوم: تحلیل احساسات
+        tab2 = QWidget()
+        tab2_layout = QVBoxLayout(tab2)
+        label2 = QLabel("🔍 یک جمله بنویس تا احساسشو بفهمیم:")
+        tab2_layout.addWidget(label2)
+
+        self.sentiment_input = QTextEdit()
+        tab2_layout.addWidget(self.sentiment_input)
+
+        self.sentiment_button = QPushButton("احساساتمو تحلیل کن")
+        tab2_layout.addWidget(self.sentiment_button)
+
+        self.sentiment_output = QLabel("✉️ نتیجه نمایش داده می‌شود...")
+        self.sentiment_output.setStyleSheet("font-weight: bold; color: #8b008b;")
+        tab2_layout.addWidget(self.sentiment_output)
+
+        self.sentiment_button.clicked.connect(self.analyze_sentiment)
+
+        # تب سوم: خلاصه‌ساز متن
+        tab3 = QWidget()
+        tab3_layout = QVBoxLayout(tab3)
+        label3 = QLabel("📝 لطفاً متن فارسی یا انگلیسی را وارد کنید:")
+        tab3_layout.addWidget(label3)
+
+        self.text_input = QTextEdit()
+        tab3_layout.addWidget(self.text_input)
+
+        self.summarize_button = QPushButton("خلاصه کن")
+        tab3_layout.addWidget(self.summarize_button)
+
+        self.result_label = QLabel("✅ خلاصه متن:")
+        tab3_layout.addWidget(self.result_label)
+
+        self.result_output = QTextEdit()
+        self.result_output.setReadOnly(True)
+        tab3_layout.addWidget(self.result_output)
+
+        self.summarize_button.clicked.connect(self.summarize_text)
+
+# تب چهارم: تنظیمات تم
+        tab4 = QWidget()
+        tab4_layout = QVBoxLayout(tab4)
+
+# هدر تب چهارم
+        self.header_tab4 = QLabel("🎨 انتخاب تم رنگی")
+        self.header_tab4.setObjectName("header_tab4")  # برای CSS جدا
+        self.header_tab4.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.header_tab4.setFont(QFont("Arial", 18, QFont.Weight.Bold))
+        tab4_layout.addWidget(self.header_tab4)
+        tab4_layout.setAlignment(self.header_tab4, Qt.AlignmentFlag.AlignTop)
+
+# دکمه‌های انتخاب تم با رنگ مخصوص (رنگ از قانون [swatch=...] همان stylesheet مشترک)
+        for theme in default_themes:
+            btn = QPushButton(theme.label)
+            btn.setProperty("swatch", theme.name)
+            btn.clicked.connect(lambda _, t=theme.name: self.change_theme(t))
+            tab4_layout.addWidget(btn)
+
+# دکمه ذخیره تم
+        save_btn = QPushButton("💾 ذخیره تم")
+        save_btn.clicked.connect(self.save_theme_with_confirm)
+        tab4_layout.addWidget(save_btn)
+
+# اضافه کردن تب چهارم به تب‌ها
+        # اضافه کردن تب‌ها
+        tabs.addTab(tab1, "چت‌بات")
+        tabs.addTab(tab2, "تحلیل احساسات")
+        tabs.addTab(tab3, "خلاصه‌ساز")
+        tabs.addTab(tab4, "تنظیمات")
+        tabs.currentChanged.connect(self.show_tab)
+
+# اضافه کردن کل تب‌ها به صفحه اصلی
+        main_layout.addWidget(tabs)
+
+
+
+    # اجرای یک کار در پس‌زمینه
+    # اگر kind داده شود، کار قبلی همان نوع (اگر هنوز شروع نشده) لغو و نتیجه‌اش دور ریخته می‌شود
+    def run_job(self, fn, *args, on_result, on_error, kind=None, pool=None):
+        pool = pool or self.thread_pool
+        worker = Worker(fn, *args)
+
+        if kind is not None:
+            old = self.jobs.get(kind)
+            if old is not None and pool.tryTake(old):
+                self.workers.discard(old)
+            self.jobs[kind] = worker
+
+        def finish(callback, value):
+            self.workers.discard(worker)
+            if kind is not None:
+                if self.jobs.get(kind) is not worker:
+                    return
+                del self.jobs[kind]
+            callback(value)
+
+        worker.signals.result.connect(lambda value: finish(on_result, value))
+        worker.signals.error.connect(lambda e: finish(on_error, e))
+        self.workers.add(worker)
+        pool.start(worker)
+        return worker
+
+    # تابع ارسال پیام در چت‌بات
+    def handle_user_input(self):
+        user_text = self.input_field.text().strip()
+        if not user_text:
+            return
+
+        self.add_chat_message(f"🧑‍💻 شما: {user_text}", Qt.AlignmentFlag.AlignRight)
+        self.input_field.clear()
+
+        self.set_chat_busy(+1)
+        self.run_job(
+            self.bot.get_response, user_text, pool=self.chat_pool,
+            on_result=lambda response: self.show_response(user_text, response),
+            on_error=self.show_chat_error,
+        )
+
+    def show_response(self, user_text, response):
+        self.set_chat_busy(-1)
+        if response:
+            self.add_chat_message(f"🤖 بات: {response}", Qt.AlignmentFlag.AlignLeft)
+        else:
+            self.add_chat_message("🤖 بات: جواب اینو بلد نیستم، لطفا یادم بده.", Qt.AlignmentFlag.AlignLeft)
+            self.ask_to_learn(user_text)
+
+    def show_chat_error(self, e):
+        self.set_chat_busy(-1)
+        self.add_chat_message(f"⚠️ خطا: {e}", Qt.AlignmentFlag.AlignLeft)
+
+    # نمایش وضعیت «در حال فکر کردن» تا وقتی پاسخی در صف است
+    def set_chat_busy(self, delta):
+        self.chat_pending += delta
+        self.input_field.setPlaceholderText("⏳ بات در حال فکر کردن..." if self.chat_pending else "")
+
+    # اضافه کردن پیام به رابط چت (و به تاریخچه روی دیسک)
+    def add_chat_message(self, text, align):
+        right = align == Qt.AlignmentFlag.AlignRight
+        self.chat_model.append(text, 'right' if right else 'left', 'user' if right else 'bot')
+        # چند پیام پشت سر هم فقط یک بار لیست را دوباره می‌چینند
+        if not self.scroll_pending:
+            self.scroll_pending = True
+            QTimer.singleShot(0, self.scroll_to_end)
+
+    def scroll_to_end(self):
+        self.scroll_pending = False
+        self.chat_area.scrollToBottom()
+
+    # خواندن پیام‌های قبلی یا بعدی وقتی اسکرول به ابتدا یا انتهای پنجره می‌رسد
+    def page_history(self, value):
+        bar = self.chat_area.verticalScrollBar()
+        model = self.chat_model
+        if value == bar.minimum() and model.start > 0:
+            added = model.load_older()
+            if added:
+                # همان پیامی که بالای لیست بود سر جایش می‌ماند
+                self.chat_area.scrollTo(model.index(added), QAbstractItemView.ScrollHint.PositionAtTop)
+        elif value == bar.maximum() and not model.at_end():
+            last = model.stop - 1
+            model.load_newer()
+            self.chat_area.scrollTo(model.index(last - model.start), QAbstractItemView.ScrollHint.PositionAtBottom)
+
+    # پیدا کردن پیام‌های قبلی؛ هر Enter روی همان متن به نتیجه قدیمی‌تر بعدی می‌رود
+    def search_history(self):
+        query = self.history_search.text().strip()
+        if not query:
+            self.search_status.setText("")
+            return
+        if query != self.search_query:
+            self.search_query = query
+            self.search_results = self.transcript.search(query)
+            self.search_pos = 0
+        elif self.search_results:
+            self.search_pos = (self.search_pos + 1) % len(self.search_results)
+
+        if not self.search_results:
+            self.search_status.setText("پیدا نشد")
+            return
+        index = self.chat_model.index(self.chat_model.move_to(self.search_results[self.search_pos]))
+        self.chat_area.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+        self.chat_area.setCurrentIndex(index)
+        self.search_status.setText(f"{self.search_pos + 1}/{len(self.search_results)}")
+
+    # دریافت پاسخ مناسب از کاربر در صورت بلد نبودن بات
+    def ask_to_learn(self, question):
+        answer, ok = QInputDialog.getText(self, "یادگیری", f"پاسخ مناسب برای '{question}' چیه؟")
+        if ok and answer.strip():
+            self.set_chat_busy(+1)
+            self.run_job(
+                self.bot.learn_new_answer, question, answer.strip(), pool=self.chat_pool,
+                on_result=lambda _: self.show_learned(),
+                on_error=self.show_chat_error,
+            )
+
+    def show_learned(self):
+        self.set_chat_busy(-1)
+        self.add_chat_message("🤖 بات: ممنون! یاد گرفتم.", Qt.AlignmentFlag.AlignLeft)
+
+    # خلاصه‌سازی متن بر اساس زبان شناسایی‌شده
+    def summarize_text(self):
+        text = self.text_input.toPlainText().strip()
+        if not text:
+            self.jobs.pop('summary', None)
+            self.result_output.setPlainText("⛔️ لطفاً متنی وارد کنید.")
+            return
+
+        self.result_output.setPlainText("⏳ در حال خلاصه‌سازی...")
+        self.run_job(
+            summarize_for_display, text, kind='summary',
+            on_result=self.result_output.setPlainText,
+            on_error=lambda e: self.result_output.setPlainText(f"⚠️ خطا در پردازش: {e}"),
+        )
+
+    # تحلیل احساسات با استفاده از کلمات موجود در دیتاست
+    def analyze_sentiment(self):
+        text = self.sentiment_input.toPlainText().strip()
+        if not text:
+            self.jobs.pop('sentiment', None)
+            self.sentiment_output.setText("⛔️ لطفاً جمله‌ای وارد کنید.")
+            return
+
+        self.sentiment_output.setText("⏳ در حال تحلیل...")
+        self.run_job(
+            classify_emotion, text, kind='sentiment',
+            on_result=self.show_sentiment,
+            on_error=lambda e: self.sentiment_output.setText(f"⚠️ خطا در پردازش: {e}"),
+        )
+
+    # نمایش احساس غالب
+    def show_sentiment(self, dominant_emotion):
+        if dominant_emotion is None:
+            self.sentiment_output.setText("🤔 هیچ احساسی شناسایی نشد.")
+        else:
+            self.sentiment_output.setText(f"😊 احساس جمله {dominant_emotion} بود.")
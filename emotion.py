@@ -0,0 +1,163 @@
+# تشخیص احساس جمله بر اساس دیتاست emotion_dataset.csv
+# دیتاست یک بار به یک دیکشنری «کلمه نرمال‌شده -> احساس(ها)» تبدیل می‌شود و
+# نسخه کامپایل‌شده روی دیسک کش می‌شود. امتیازدهی هر جمله فقط یک پیمایش روی متن است:
+# یا با ماشین Aho-Corasick (emotion_matcher، شکل‌های صرفی و عبارت‌ها را هم پیدا می‌کند)
+# یا با روش قدیمی جستجوی تک‌تک توکن‌ها در دیکشنری.
+import csv
+import hashlib
+import os
+import pickle
+
+from emotion_matcher import EmotionMatcher
+from text_pipeline import default_pipeline
+
+
+# احساس‌ها به ترتیب اولویت (همان ترتیب زنجیره elif قبلی)
+EMOTIONS = ('مضطرب', 'حسادت', 'عصبانی', 'عشق', 'خوشحال', 'ناراحت', 'نفرت')
+
+# نام‌های دیگری که برای یک احساس استفاده شده‌اند
+# (کد قبلی دنبال «خوشحالی» می‌گشت ولی دیتاست «خوشحال» دارد)
+EMOTION_ALIASES = {'خوشحالی': 'خوشحال'}
+
+# سیاست امتیازدهی کلماتی که در دیتاست زیر چند احساس آمده‌اند:
+#   split: امتیاز یک کلمه به نسبت تعداد تکرار هر برچسب در دیتاست تقسیم می‌شود
+#   all:   هر احساس کلمه یک امتیاز کامل می‌گیرد
+#   first: فقط احساس اول به ترتیب EMOTIONS امتیاز می‌گیرد (رفتار قدیمی)
+MULTI_LABEL_POLICIES = ('split', 'all', 'first')
+
+# روش پیدا کردن کلمات احساسی در متن:
+#   automaton: ماشین Aho-Corasick روی متن نرمال‌شده (با پسوند/پیشوند و عبارت‌های چندکلمه‌ای)
+#   tokens:    فقط توکن‌هایی که عینا در دیتاست هستند
+MATCHERS = ('automaton', 'tokens')
+
+CACHE_VERSION = 3
+
+
+class EmotionClassifier:
+    def __init__(self, dataset_path, cache_path=None, policy='split', pipeline=None, matcher='automaton'):
+        if policy not in MULTI_LABEL_POLICIES:
+            raise ValueError(f"unknown multi-label policy: {policy}")
+        if matcher not in MATCHERS:
+            raise ValueError(f"unknown matcher: {matcher}")
+        self.dataset_path = dataset_path
+        self.cache_path = cache_path or dataset_path + ".cache"
+        self.policy = policy
+        # نرمال‌سازی و توکن‌سازی مشترک با خلاصه‌ساز
+        self.pipeline = pipeline or default_pipeline
+        self.use_automaton = matcher == 'automaton'
+        # کلمه -> لیست (احساس، وزن) و ماشین Aho-Corasick همان کلمات؛ هر دو از کش روی دیسک
+        self.lexicon, self.matcher = self.load_lexicon()
+
+    def normalize(self, text, cache=True):
+        return self.pipeline.normalize(text, cache=cache).lower()
+
+    # بارگذاری (دیکشنری، ماشین) از کش، یا ساختن آن‌ها از CSV در صورت تغییر فایل
+    def load_lexicon(self):
+        stat = os.stat(self.dataset_path)
+        cached = self._read_cache()
+        if cached is not None and cached['policy'] == self.policy:
+            loaded = cached['lexicon'], cached['matcher']
+            if (cached['mtime'], cached['size']) == (stat.st_mtime_ns, stat.st_size):
+                return loaded
+            # زمان تغییر فایل عوض شده ولی شاید محتوا همان باشد
+            if cached['sha1'] == self._file_hash():
+                self._write_cache(*loaded, stat)
+                return loaded
+
+        lexicon = self.compile()
+        matcher = EmotionMatcher(lexicon, EMOTIONS)
+        self._write_cache(lexicon, matcher, stat)
+        return lexicon, matcher
+
+    # تبدیل دیتاست به دیکشنری کلمه -> احساس‌ها
+    def compile(self):
+        labels = {}
+        with open(self.dataset_path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                word = self.normalize(row['word'].strip(), cache=False)
+                emotion = row['emotion'].strip()
+                emotion = EMOTION_ALIASES.get(emotion, emotion)
+                if not word or emotion not in EMOTIONS:
+                    continue
+                counts = labels.setdefault(word, {})
+                counts[emotion] = counts.get(emotion, 0) + 1
+
+        lexicon = {}
+        for word, counts in labels.items():
+            ordered = sorted(counts, key=EMOTIONS.index)
+            if self.policy == 'first':
+                lexicon[word] = ((ordered[0], 1.0),)
+            elif self.policy == 'all':
+                lexicon[word] = tuple((emotion, 1.0) for emotion in ordered)
+            else:
+                total = sum(counts.values())
+                lexicon[word] = tuple((emotion, counts[emotion] / total) for emotion in ordered)
+        return lexicon
+
+    def _file_hash(self):
+        digest = hashlib.sha1()
+        with open(self.dataset_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if not isinstance(cached, dict) or cached.get('version') != CACHE_VERSION:
+            return None
+        return cached
+
+    def _write_cache(self, lexicon, matcher, stat):
+        cached = {
+            'version': CACHE_VERSION,
+            'policy': self.policy,
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha1': self._file_hash(),
+            'lexicon': lexicon,
+            'matcher': matcher,
+        }
+        # نام یکتا برای هر پروسس (کارگرها ممکن است همزمان کش را بسازند)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # اگر پوشه قابل نوشتن نباشد فقط بدون کش کار می‌کنیم
+            pass
+
+    # امتیاز هر احساس برای یک متن (یک پیمایش روی توکن‌ها)
+    def score_tokens(self, tokens):
+        scores = dict.fromkeys(EMOTIONS, 0)
+        lexicon = self.lexicon
+        for token in tokens:
+            labels = lexicon.get(token)
+            if labels:
+                for emotion, weight in labels:
+                    scores[emotion] += weight
+        return scores
+
+    def score(self, text):
+        if self.use_automaton:
+            return self.matcher.score(self.normalize(text))
+        return self.score_tokens(self.pipeline.word_tokenize(self.normalize(text)))
+
+    # امتیازها به همراه محل کلمات پیدا شده: (امتیازها، لیست (شروع، پایان، مدخل، برچسب‌ها))
+    # محل‌ها روی متن نرمال‌شده (normalize) هستند
+    def match(self, text):
+        return self.matcher.match(self.normalize(text))
+
+    # احساس غالب متن؛ اگر هیچ کلمه احساسی پیدا نشود None برمی‌گرداند
+    # (در صورت تساوی، احساس جلوتر در EMOTIONS انتخاب می‌شود)
+    @staticmethod
+    def dominant(scores):
+        best = max(EMOTIONS, key=lambda emotion: scores[emotion])
+        return best if scores[best] > 0 else None
+
+    def classify(self, text):
+        return self.dominant(self.score(text))
@@ -0,0 +1,170 @@
+# تشخیص احساس دسته‌ای برای فایل‌های بزرگ (بدون رابط گرافیکی)
+# جمله‌ها خط به خط از فایل یا stdin خوانده می‌شوند، به صورت تکه‌تکه بین چند
+# پروسس تقسیم می‌شوند و نتیجه همان لحظه به صورت CSV یا JSONL نوشته می‌شود.
+#
+#   python emotion_batch.py chat_log.txt -o result.jsonl --workers 4
+#   cat chat_log.txt | python emotion_batch.py - --format csv > result.csv
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from emotion import EMOTIONS, MATCHERS, MULTI_LABEL_POLICIES, EmotionClassifier
+from file_watch import file_signature
+
+
+DEFAULT_DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "emotion_dataset.csv")
+
+# دسته‌بند هر پروسس کارگر (یک بار از کش روی دیسک بارگذاری می‌شود)
+_worker_classifier = None
+# با reload=True امضای فایل دیتاست قبل از هر تکه بررسی و در صورت تغییر دوباره خوانده می‌شود
+_worker_args = None
+_worker_signature = None
+
+
+def init_worker(dataset_path, cache_path, policy, reload=False, matcher='automaton'):
+    global _worker_classifier, _worker_args, _worker_signature
+    _worker_args = (dataset_path, cache_path, policy, matcher) if reload else None
+    _worker_signature = file_signature(dataset_path)
+    _worker_classifier = EmotionClassifier(dataset_path, cache_path, policy, matcher=matcher)
+
+
+def _refresh_worker():
+    global _worker_classifier, _worker_signature
+    dataset_path, cache_path, policy, matcher = _worker_args
+    signature = file_signature(dataset_path)
+    if signature is not None and signature != _worker_signature:
+        _worker_classifier = EmotionClassifier(dataset_path, cache_path, policy, matcher=matcher)
+        _worker_signature = signature
+
+
+def score_chunk(lines):
+    if _worker_args is not None:
+        _refresh_worker()
+    classifier = _worker_classifier
+    results = []
+    for line in lines:
+        scores = classifier.score(line)
+        results.append((classifier.dominant(scores), scores))
+    return results
+
+
+def _chunks(lines, chunk_size):
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# امتیازدهی جریانی: خروجی به ترتیب ورودی و (جمله، احساس غالب، امتیازها) است.
+# حداکثر workers * 2 تکه همزمان در حافظه هستند.
+def score_stream(lines, dataset_path=DEFAULT_DATASET, cache_path=None, policy='split',
+                 workers=None, chunk_size=1000, matcher='automaton'):
+    # ساخت یا به‌روز کردن کش دیتاست پیش از شروع کارگرها
+    classifier = EmotionClassifier(dataset_path, cache_path, policy, matcher=matcher)
+    workers = os.cpu_count() if workers is None else workers
+
+    if workers <= 1:
+        for line in lines:
+            scores = classifier.score(line)
+            yield line, classifier.dominant(scores), scores
+        return
+
+    with ProcessPoolExecutor(workers, initializer=init_worker,
+                             initargs=(dataset_path, classifier.cache_path, policy, False, matcher)) as pool:
+        pending = deque()
+        for chunk in _chunks(lines, chunk_size):
+            pending.append((chunk, pool.submit(score_chunk, chunk)))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield from _merge(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield from _merge(chunk, future.result())
+
+
+def _merge(chunk, results):
+    for line, (emotion, scores) in zip(chunk, results):
+        yield line, emotion, scores
+
+
+class _CsvWriter:
+    def __init__(self, out):
+        self.writer = csv.writer(out)
+        self.writer.writerow(['text', 'emotion', *EMOTIONS])
+
+    def write(self, line, emotion, scores):
+        self.writer.writerow([line, emotion or '', *(scores[e] for e in EMOTIONS)])
+
+
+class _JsonlWriter:
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, line, emotion, scores):
+        record = {'text': line, 'emotion': emotion, 'scores': scores}
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+WRITERS = {'csv': _CsvWriter, 'jsonl': _JsonlWriter}
+
+
+# پردازش کامل یک جریان ورودی و نوشتن خروجی؛ تعداد جمله‌ها و سرعت را برمی‌گرداند
+def run(lines, out, fmt='jsonl', report_every=100000, log=sys.stderr, **options):
+    writer = WRITERS[fmt](out)
+    start = time.perf_counter()
+    count = 0
+    for line, emotion, scores in score_stream(lines, **options):
+        writer.write(line, emotion, scores)
+        count += 1
+        if log and report_every and count % report_every == 0:
+            elapsed = time.perf_counter() - start
+            print(f"{count} sentences, {count / elapsed:.0f} sentences/sec", file=log)
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    if log:
+        print(f"done: {count} sentences in {elapsed:.2f}s ({rate:.0f} sentences/sec)", file=log)
+    return count, rate
+
+
+def _read_lines(f):
+    for line in f:
+        yield line.rstrip("\r\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch emotion detection for Persian sentences.")
+    parser.add_argument('input', help="input file with one sentence per line, or - for stdin")
+    parser.add_argument('-o', '--output', default='-', help="output file (default: stdout)")
+    parser.add_argument('--format', choices=sorted(WRITERS), default='jsonl')
+    parser.add_argument('--dataset', default=DEFAULT_DATASET, help="emotion dataset CSV")
+    parser.add_argument('--policy', choices=MULTI_LABEL_POLICIES, default='split', help="multi-label policy")
+    parser.add_argument('--matcher', choices=MATCHERS, default='automaton',
+                        help="automaton also finds inflected forms and phrases; tokens only exact words")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--report-every', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    fin = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    fout = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        run(_read_lines(fin), fout, fmt=args.format, report_every=args.report_every,
+            dataset_path=args.dataset, policy=args.policy, matcher=args.matcher,
+            workers=args.workers, chunk_size=args.chunk_size)
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+        if fout is not sys.stdout:
+            fout.close()
+
+
+if __name__ == "__main__":
+    main()
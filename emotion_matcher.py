@@ -0,0 +1,181 @@
+# پیدا کردن کلمات و عبارت‌های احساسی با الگوریتم Aho-Corasick
+# همه مدخل‌های دیتاست (کلمه یا عبارت چندکلمه‌ای) در یک ماشین حالت کامپایل می‌شوند و
+# متن نرمال‌شده فقط یک بار از اول تا آخر پیمایش می‌شود. شکل‌های صرفی فارسی
+# (ها/های، ضمیرهای ملکی، تر/ترین، شناسه‌ها و پیشوند می/نمی) به جای ضرب شدن در
+# تعداد کلمات، در جدول مشترک پسوند و پیشوند نگه داشته می‌شوند و هنگام تطبیق دور
+# هر مدخل پیدا شده بررسی می‌شوند؛ پس دیتاست‌های خیلی بزرگ هم ماشین کوچکی دارند.
+# نیم‌فاصله در تطبیق نادیده گرفته می‌شود («کتاب‌ها» و «کتابها» یکی هستند).
+from array import array
+from bisect import bisect_right
+
+
+ZWNJ = '\u200c'
+
+# پسوندها و پیشوندهای مجاز (بلندترها اول بررسی می‌شوند): جمع، ضمیرهای ملکی
+# (م ت ش مان تان شان، ام ات اش بعد از ه)، ی/ای، شناسه‌ها و تر/ترین
+SUFFIXES = tuple(sorted((
+    'ها', 'های', 'هایم', 'هایت', 'هایش', 'هایمان', 'هایتان', 'هایشان',
+    'م', 'ت', 'ش', 'مان', 'تان', 'شان',
+    'ام', 'ات', 'اش',
+    'ی', 'ای',
+    'یم', 'ید', 'ند',
+    'تر', 'ترین',
+), key=len, reverse=True))
+PREFIXES = ('نمی', 'می')
+
+
+def _is_arabic_script(ch):
+    return '\u0600' <= ch <= '\u06ff'
+
+
+def _is_word_char(ch):
+    return ch.isalnum()
+
+
+class EmotionMatcher:
+    # lexicon: مدخل نرمال‌شده -> لیست (احساس، وزن)، همان دیکشنری EmotionClassifier
+    # emotions: کلیدهای دیکشنری امتیازها (به ترتیب اولویت)
+    def __init__(self, lexicon, emotions, affixes=True):
+        self.emotions = tuple(emotions)
+        self.affixes = affixes
+        self.entries = []                 # شماره الگو -> (مدخل، طول، برچسب‌ها، فارسی؟)
+        self.delta = {}                   # (حالت << 21) | کد کاراکتر -> حالت بعدی
+        self.fail = array('i', [0])
+        self.terminal = array('i', [-1])  # حالت -> شماره الگو یا -1
+        self.output = array('i', [0])     # حالت -> نزدیک‌ترین حالت پایانی در زنجیره fail
+        self._build(lexicon)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _build(self, lexicon):
+        delta = self.delta
+        children = [[]]
+        for entry, labels in lexicon.items():
+            key = entry.replace(ZWNJ, '')
+            if not key:
+                continue
+            state = 0
+            for ch in key:
+                code = (state << 21) | ord(ch)
+                nxt = delta.get(code)
+                if nxt is None:
+                    nxt = len(self.fail)
+                    delta[code] = nxt
+                    children[state].append((ord(ch), nxt))
+                    children.append([])
+                    self.fail.append(0)
+                    self.terminal.append(-1)
+                    self.output.append(0)
+                state = nxt
+            if self.terminal[state] == -1:
+                self.terminal[state] = len(self.entries)
+                self.entries.append((entry, len(key), labels, _is_arabic_script(key[-1])))
+
+        # محاسبه fail و زنجیره خروجی به ترتیب سطح (BFS)
+        queue = [nxt for _, nxt in children[0]]
+        for state in queue:
+            for code, nxt in children[state]:
+                f = self.fail[state]
+                while True:
+                    target = delta.get((f << 21) | code)
+                    if target is not None and target != nxt:
+                        break
+                    if f == 0:
+                        target = 0
+                        break
+                    f = self.fail[f]
+                self.fail[nxt] = target
+                self.output[nxt] = target if self.terminal[target] != -1 else self.output[target]
+                queue.append(nxt)
+
+    # تطبیق‌های نهایی روی متن نرمال‌شده: لیست (شروع، پایان، مدخل، برچسب‌ها)
+    # مدخل باید یک کلمه کامل باشد، مگر این‌که با پسوند یا پیشوند مجاز چسبیده باشد.
+    # از تطبیق‌های هم‌پوشان، اولین و بلندترین نگه داشته می‌شود.
+    def find(self, text):
+        # محل نیم‌فاصله‌ها برای برگرداندن محل تطبیق‌ها به متن اصلی
+        gaps = []
+        pos = text.find(ZWNJ)
+        while pos != -1:
+            gaps.append(pos - len(gaps))
+            pos = text.find(ZWNJ, pos + 1)
+        flat = text.replace(ZWNJ, '') if gaps else text
+        n = len(flat)
+
+        delta, fail, terminal, output = self.delta, self.fail, self.terminal, self.output
+        entries, affixes = self.entries, self.affixes
+        candidates = []
+        state = 0
+        for j, ch in enumerate(flat):
+            code = ord(ch)
+            while True:
+                nxt = delta.get((state << 21) | code)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            hit = state if terminal[state] != -1 else output[state]
+            while hit:
+                pattern = terminal[hit]
+                hit = output[hit]
+                _, length, _, persian = entries[pattern]
+                start, end = j + 1 - length, j + 1
+                if end < n and _is_word_char(flat[end]):
+                    if not (affixes and persian):
+                        continue
+                    end = self._suffix_end(flat, end)
+                    if end is None:
+                        continue
+                if start > 0 and _is_word_char(flat[start - 1]):
+                    if not (affixes and persian):
+                        continue
+                    start = self._prefix_start(flat, start)
+                    if start is None:
+                        continue
+                candidates.append((start, -end, pattern))
+
+        matches = []
+        last = 0
+        for start, neg_end, pattern in sorted(candidates):
+            if start < last:
+                continue
+            end = -neg_end
+            last = end
+            entry, _, labels, _ = entries[pattern]
+            if gaps:
+                start += bisect_right(gaps, start)
+                end = end - 1 + bisect_right(gaps, end - 1) + 1
+            matches.append((start, end, entry, labels))
+        return matches
+
+    @staticmethod
+    def _suffix_end(text, end):
+        n = len(text)
+        for suffix in SUFFIXES:
+            stop = end + len(suffix)
+            if text.startswith(suffix, end) and (stop == n or not _is_word_char(text[stop])):
+                return stop
+        return None
+
+    @staticmethod
+    def _prefix_start(text, start):
+        for prefix in PREFIXES:
+            begin = start - len(prefix)
+            if begin >= 0 and text.startswith(prefix, begin) and (
+                    begin == 0 or not _is_word_char(text[begin - 1])):
+                return begin
+        return None
+
+    # امتیاز هر احساس و محل تطبیق‌ها
+    def match(self, text):
+        scores = dict.fromkeys(self.emotions, 0)
+        matches = self.find(text)
+        for _, _, _, labels in matches:
+            for emotion, weight in labels:
+                scores[emotion] += weight
+        return scores, matches
+
+    def score(self, text):
+        return self.match(text)[0]
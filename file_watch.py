@@ -0,0 +1,117 @@
+# زیر نظر گرفتن تغییر فایل‌ها برای بارگذاری دوباره بدون ری‌استارت
+# در لینوکس inotify (با ctypes، روی پوشه فایل‌ها چون جایگزینی با rename فایل جدیدی می‌سازد)
+# فقط برای بیدار شدن فوری استفاده می‌شود؛ در بقیه سیستم‌ها یا اگر inotify در دسترس
+# نباشد، هر interval ثانیه فایل‌ها بررسی می‌شوند. تصمیم نهایی همیشه با مقایسه stat
+# فایل (inode، زمان تغییر و اندازه) است، پس رویدادهای تکراری یا بی‌ربط بی‌اثرند.
+import ctypes
+import os
+import select
+import sys
+import threading
+
+
+# رویدادهای inotify (از sys/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+# ساخت inotify روی پوشه‌ها؛ None اگر سیستم آن را نداشته باشد
+def _inotify(directories):
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    for directory in directories:
+        if libc.inotify_add_watch(fd, os.fsencode(directory), _MASK) < 0:
+            os.close(fd)
+            return None
+    return fd
+
+
+class FileWatcher:
+    # فاصله بررسی در حالت polling (و حداکثر تاخیر در حالت inotify) به ثانیه
+    INTERVAL = 1.0
+    # صبر کوتاه بعد از اولین رویداد تا چند نوشتن پشت سر هم یک بار خوانده شوند
+    DEBOUNCE = 0.05
+
+    def __init__(self, interval=INTERVAL, debounce=DEBOUNCE):
+        self.interval = interval
+        self.debounce = debounce
+        self.watches = {}     # مسیر -> [امضای stat، لیست callback ها]
+        self.inotify = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    # callback(path) بعد از هر تغییر فایل (در رشته watcher) صدا زده می‌شود
+    def watch(self, path, callback):
+        path = os.path.abspath(path)
+        entry = self.watches.setdefault(path, [file_signature(path), []])
+        entry[1].append(callback)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        fd = _inotify({os.path.dirname(path) for path in self.watches})
+        self.inotify = fd is not None
+        try:
+            while not self._stop.is_set():
+                if fd is None:
+                    self._stop.wait(self.interval)
+                elif select.select([fd], [], [], self.interval)[0]:
+                    self._stop.wait(self.debounce)
+                    self._drain(fd)
+                self.check()
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    @staticmethod
+    def _drain(fd):
+        try:
+            while os.read(fd, 1 << 16):
+                pass
+        except BlockingIOError:
+            pass
+
+    # بررسی همه فایل‌ها و صدا زدن callback فایل‌های تغییرکرده
+    def check(self):
+        changed = []
+        for path, entry in self.watches.items():
+            signature = file_signature(path)
+            if signature != entry[0]:
+                entry[0] = signature
+                changed.append((path, entry[1]))
+        for path, callbacks in changed:
+            for callback in callbacks:
+                try:
+                    callback(path)
+                except Exception as e:
+                    # فایل نیمه‌نوشته یا خراب: تغییر بعدی دوباره امتحان می‌شود
+                    print(f"reloading {path} failed: {e}", file=sys.stderr)
+        return [path for path, _ in changed]
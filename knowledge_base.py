@@ -0,0 +1,292 @@
+# نگهداری فشرده پایگاه دانش در حافظه
+# به جای لیستی از dict ها (یک شیء پایتونی برای هر سوال و هر جواب)، رشته‌ها پشت
+# سر هم در یک بافر UTF-8 و محل شروع هر کدام در یک آرایه نگه داشته می‌شوند.
+# جواب‌های تکراری فقط یک بار ذخیره می‌شوند. همین جدول‌ها در فرمت باینری
+# (فایل .kb) بدون تبدیل روی دیسک نوشته می‌شوند و با mmap باز می‌شوند؛ پس
+# بالا آمدن برنامه تقریبا فوری است و چند پروسس صفحه‌های فایل را با هم شریک می‌شوند.
+# فرمت {"questions": [...]} همچنان برای خروجی گرفتن (to_dict) در دسترس است.
+import json
+import mmap
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import chain
+
+
+MAGIC = b"UFKB\x01\x00\x00\x00"
+# پسوند فایل‌هایی که با فرمت باینری نوشته می‌شوند
+BINARY_SUFFIX = ".kb"
+_ALIGN = 8
+
+
+# ---------------------------------------------------------------- فایل بخش‌بندی‌شده
+
+# نوشتن چند آرایه (bytes یا array) در یک فایل با سرآیند JSON؛ هر بخش هم‌تراز ۸ بایت است
+def write_sections(f, sections, meta=None):
+    directory = {}
+    offset = 0
+    for name, value in sections.items():
+        typecode = value.typecode if isinstance(value, array) else 'B'
+        length = len(value) * (value.itemsize if isinstance(value, array) else 1)
+        directory[name] = [offset, length, typecode]
+        offset += -(-length // _ALIGN) * _ALIGN
+
+    header = json.dumps({
+        'byteorder': sys.byteorder, 'meta': meta or {}, 'sections': directory,
+    }).encode('utf-8')
+    header += b" " * (-(len(MAGIC) + 8 + len(header)) % _ALIGN)
+    f.write(MAGIC)
+    f.write(len(header).to_bytes(8, 'little'))
+    f.write(header)
+    for name, value in sections.items():
+        data = value.tobytes() if isinstance(value, array) else bytes(value)
+        f.write(data)
+        f.write(b"\0" * (-len(data) % _ALIGN))
+
+
+def is_binary(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except FileNotFoundError:
+        return False
+
+
+# باز کردن فایل با mmap؛ (بخش‌ها، meta). بخش‌های عددی memoryview روی خود فایل هستند
+# و بخش‌های بایتی به صورت (mmap، شروع، پایان) برگردانده می‌شوند
+def read_sections(path):
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mm[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a knowledge base file")
+    header_len = int.from_bytes(mm[len(MAGIC):len(MAGIC) + 8], 'little')
+    start = len(MAGIC) + 8
+    header = json.loads(mm[start:start + header_len])
+    if header['byteorder'] != sys.byteorder:
+        raise ValueError(f"{path} was written on a machine with a different byte order")
+
+    base = start + header_len
+    view = memoryview(mm)
+    sections = {}
+    for name, (offset, length, typecode) in header['sections'].items():
+        begin = base + offset
+        if typecode == 'B':
+            sections[name] = (mm, begin, begin + length)
+        else:
+            sections[name] = view[begin:begin + length].cast(typecode)
+    return sections, header['meta']
+
+
+# ---------------------------------------------------------------- جدول رشته‌ها
+
+# رشته‌ها پشت سر هم در یک بافر؛ بخش ثابت (مثلا از mmap) به اضافه بخش قابل افزایش
+class StringTable:
+    def __init__(self, intern=False, frozen=None):
+        # بخش ثابت: (بافر، شروع، آرایه offset ها با طول n+1)
+        if frozen is not None:
+            self._fbuf, self._fstart, self._foffsets = frozen
+            self._fcount = len(self._foffsets) - 1
+        else:
+            self._fbuf, self._fstart, self._foffsets, self._fcount = b"", 0, (0,), 0
+        self._data = bytearray()
+        self._offsets = array('Q', [0])
+        # اینترن کردن فقط روی بخش قابل افزایش (بخش ثابت هنگام نوشتن یکتا شده است)؛
+        # کلید hash رشته است تا خود رشته‌ها در حافظه نمانند
+        self._ids = {} if intern else None
+
+    @classmethod
+    def from_sections(cls, sections, name, intern=False):
+        buf, start, _ = sections[f"{name}.data"]
+        return cls(intern, (buf, start, sections[f"{name}.offsets"]))
+
+    def __len__(self):
+        return self._fcount + len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if i < self._fcount:
+            offsets, start = self._foffsets, self._fstart
+            return self._fbuf[start + offsets[i]:start + offsets[i + 1]].decode('utf-8')
+        i -= self._fcount
+        if i >= len(self._offsets) - 1:
+            raise IndexError("string table index out of range")
+        return self._data[self._offsets[i]:self._offsets[i + 1]].decode('utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, text):
+        if self._ids is not None:
+            h = hash(text)
+            idx = self._ids.get(h)
+            if idx is not None and self[idx] == text:
+                return idx
+        self._data += text.encode('utf-8')
+        self._offsets.append(len(self._data))
+        idx = len(self) - 1
+        if self._ids is not None:
+            self._ids.setdefault(h, idx)
+        return idx
+
+    # اولین رشته‌ای که text داخل آن باشد (جستجو مستقیما روی بایت‌ها)
+    def find_containing(self, text):
+        needle = text.encode('utf-8')
+        if not needle:
+            return 0 if len(self) else None
+        for buf, start, offsets, count, base in (
+            (self._fbuf, self._fstart, self._foffsets, self._fcount, 0),
+            (self._data, 0, self._offsets, len(self._offsets) - 1, self._fcount),
+        ):
+            end = start + offsets[count]
+            pos = buf.find(needle, start, end)
+            while pos != -1:
+                i = bisect_right(offsets, pos - start, 0, count + 1) - 1
+                # تطبیق نباید از مرز دو رشته رد شود
+                if pos + len(needle) <= start + offsets[i + 1]:
+                    return base + i
+                pos = buf.find(needle, start + offsets[i + 1], end)
+        return None
+
+    # بخش‌ها برای نوشتن در فایل باینری (کل جدول به صورت یک تکه)
+    def sections(self, name):
+        data = bytearray(self._fbuf[self._fstart:self._fstart + self._foffsets[self._fcount]])
+        shift = len(data)
+        data += self._data
+        offsets = array('Q', self._foffsets)
+        offsets.extend(shift + o for o in self._offsets[1:])
+        return {f"{name}.data": data, f"{name}.offsets": offsets}
+
+
+# ---------------------------------------------------------------- لیست‌های ارجاع
+
+# دو لیست ارجاع پشت سر هم (بخش ثابت و بخش جدید) بدون کپی
+class _Chain:
+    __slots__ = ('parts',)
+
+    def __init__(self, *parts):
+        self.parts = parts
+
+    def __len__(self):
+        return sum(len(p) for p in self.parts)
+
+    def __iter__(self):
+        return chain(*self.parts)
+
+
+# نگاشت عبارت -> لیست صعودی اندیس‌ها؛ بخش ثابت به صورت CSR مرتب و بخش جدید در dict
+class PostingTable:
+    def __init__(self, frozen=None):
+        if frozen is not None:
+            self._terms, self._offsets, self._postings = frozen
+        else:
+            self._terms, self._offsets, self._postings = StringTable(), (0,), ()
+        self._new = {}      # عبارت -> array('I') برای اندیس‌های اضافه‌شده بعد از بارگذاری
+
+    @classmethod
+    def from_sections(cls, sections, name):
+        terms = StringTable.from_sections(sections, f"{name}.terms")
+        return cls((terms, sections[f"{name}.offsets"], sections[f"{name}.postings"]))
+
+    def _frozen(self, term):
+        terms = self._terms
+        i = bisect_left(terms, term)
+        if i < len(terms) and terms[i] == term:
+            return self._postings[self._offsets[i]:self._offsets[i + 1]]
+        return None
+
+    def get(self, term, default=None):
+        frozen = self._frozen(term) if len(self._terms) else None
+        new = self._new.get(term)
+        if frozen is None:
+            return default if new is None else new
+        return frozen if new is None else _Chain(frozen, new)
+
+    def add(self, term, idx):
+        posting = self._new.get(term)
+        if posting is None:
+            posting = self._new[term] = array('I')
+        posting.append(idx)
+
+    def sections(self, name):
+        terms = sorted(set(self._terms) | set(self._new))
+        table = StringTable()
+        offsets = array('Q', [0])
+        postings = array('I')
+        for term in terms:
+            table.append(term)
+            postings.extend(self.get(term))
+            offsets.append(len(postings))
+        return {**table.sections(f"{name}.terms"), f"{name}.offsets": offsets, f"{name}.postings": postings}
+
+
+# ---------------------------------------------------------------- پایگاه دانش
+
+class KnowledgeBase:
+    def __init__(self, questions=None, answers=None, answer_ids=None, sections=None):
+        self.questions = questions if questions is not None else StringTable()
+        self.answers = answers if answers is not None else StringTable(intern=True)
+        self.answer_ids = answer_ids if answer_ids is not None else array('I')
+        # بخش‌های فایل باینری (برای بارگذاری ایندکس سوالات بدون ساخت دوباره)
+        self.sections = sections
+        self._new_ids = array('I')
+
+    @classmethod
+    def from_dict(cls, data):
+        kb = cls()
+        for q in data.get('questions', []):
+            kb.append(q['question'], q['answer'])
+        return kb
+
+    @classmethod
+    def from_sections(cls, sections):
+        return cls(
+            StringTable.from_sections(sections, 'questions'),
+            StringTable.from_sections(sections, 'answers', intern=True),
+            sections['answer_ids'],
+            sections,
+        )
+
+    @classmethod
+    def open(cls, path):
+        return cls.from_sections(read_sections(path)[0])
+
+    def __len__(self):
+        return len(self.answer_ids) + len(self._new_ids)
+
+    def question(self, i):
+        return self.questions[i]
+
+    def answer(self, i):
+        base = len(self.answer_ids)
+        return self.answers[self.answer_ids[i] if i < base else self._new_ids[i - base]]
+
+    def append(self, question, answer):
+        self.questions.append(question)
+        self._new_ids.append(self.answers.append(answer))
+        return len(self) - 1
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.question(i), self.answer(i)
+
+    # آیا سوال‌های other به همان ترتیب ابتدای این پایگاه دانش هستند (فقط سوال اضافه شده)
+    def extends(self, other):
+        if len(self) < len(other):
+            return False
+        return all(self.question(i) == other.question(i) for i in range(len(other)))
+
+    # نمای قبلی {"questions": [...]} برای خروجی JSON
+    def to_dict(self):
+        return {'questions': [{'question': q, 'answer': a} for q, a in self]}
+
+    # بخش‌های فایل باینری؛ جواب‌ها دوباره یکتا می‌شوند
+    def to_sections(self):
+        answers = StringTable(intern=True)
+        answer_ids = array('I', (answers.append(self.answer(i)) for i in range(len(self))))
+        return {
+            **self.questions.sections('questions'),
+            **answers.sections('answers'),
+            'answer_ids': answer_ids,
+        }
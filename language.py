@@ -0,0 +1,106 @@
+# تشخیص سریع زبان متن بر اساس خط (حروف عربی/فارسی در برابر لاتین)
+# فقط یک نمونه محدود از متن بررسی می‌شود. اگر نتیجه روشن نباشد از langdetect
+# (با seed ثابت تا نتیجه تکرارپذیر باشد) کمک گرفته می‌شود. نتیجه هر متن با
+# هش آن در یک کش LRU نگه داشته می‌شود.
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+
+ARABIC_SCRIPT = re.compile("[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]")
+LATIN_SCRIPT = re.compile("[A-Za-z\u00C0-\u024F]")
+# حروفی که در فارسی هست ولی در عربی نیست
+PERSIAN_LETTERS = re.compile("[\u067E\u0686\u0698\u06AF\u06A9\u06CC]")  # پ چ ژ گ ک ی
+LATIN_WORD = re.compile(r"[a-z]+")
+
+# کلمات پرتکرار انگلیسی برای تشخیص انگلیسی بدون langdetect
+ENGLISH_COMMON = frozenset(
+    "the a an and or of to in on is are was were be it this that for with as at by from "
+    "i you he she we they not have has do does can will my your what how why who".split()
+)
+
+
+class LanguageRouter:
+    # حداکثر تعداد کاراکتری که از متن بررسی می‌شود
+    SAMPLE_SIZE = 2000
+    # اگر سهم یک خط از حروف متن حداقل این مقدار باشد، متن به آن خط تعلق دارد
+    SCRIPT_THRESHOLD = 0.8
+    # حداقل سهم کلمات پرتکرار انگلیسی برای اینکه متن لاتین انگلیسی حساب شود
+    ENGLISH_THRESHOLD = 0.1
+
+    def __init__(self, cache_size=1024, seed=0):
+        self.cache_size = cache_size
+        self.seed = seed
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.fallbacks = 0
+
+    # نمونه‌ای از ابتدا، وسط و انتهای متن
+    def sample(self, text):
+        size = self.SAMPLE_SIZE
+        if len(text) <= size:
+            return text
+        part = size // 3
+        middle = len(text) // 2
+        return text[:part] + " " + text[middle - part // 2:middle + part // 2] + " " + text[-part:]
+
+    # خط غالب متن: 'arabic'، 'latin'، 'mixed' یا None (اگر حرفی نداشته باشد)
+    def script(self, text):
+        sample = self.sample(text)
+        arabic = len(ARABIC_SCRIPT.findall(sample))
+        latin = len(LATIN_SCRIPT.findall(sample))
+        total = arabic + latin
+        if total == 0:
+            return None
+        if arabic / total >= self.SCRIPT_THRESHOLD:
+            return 'arabic'
+        if latin / total >= self.SCRIPT_THRESHOLD:
+            return 'latin'
+        return 'mixed'
+
+    # تشخیص زبان بدون langdetect؛ اگر مطمئن نباشد None برمی‌گرداند
+    def quick_detect(self, text):
+        script = self.script(text)
+        sample = self.sample(text)
+        if script == 'arabic' and PERSIAN_LETTERS.search(sample):
+            return 'fa'
+        if script == 'latin':
+            words = LATIN_WORD.findall(sample.lower())
+            if words and sum(w in ENGLISH_COMMON for w in words) / len(words) >= self.ENGLISH_THRESHOLD:
+                return 'en'
+        return None
+
+    def langdetect(self, text):
+        from langdetect import DetectorFactory, detect
+        from langdetect.lang_detect_exception import LangDetectException
+
+        DetectorFactory.seed = self.seed
+        self.fallbacks += 1
+        try:
+            return detect(self.sample(text))
+        except LangDetectException:
+            return None
+
+    # کد زبان متن ('fa'، 'en'، ...) یا None
+    def detect(self, text):
+        key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+
+        lang = self.quick_detect(text) or self.langdetect(text)
+
+        with self.lock:
+            self.cache[key] = lang
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return lang
+
+
+default_router = LanguageRouter()
+
+
+def detect_language(text):
+    return default_router.detect(text)
@@ -0,0 +1,258 @@
+# اندازه‌گیری زمان مراحل مختلف برنامه (هیستوگرام و شمارنده)
+# وقتی خاموش است stage() یک context خالی برمی‌گرداند و تقریبا هزینه‌ای ندارد.
+# با UNDERFEEL_METRICS=1 یا آرگومان --metrics روشن می‌شود و خروجی آن به صورت
+# JSON یا متن Prometheus گرفته می‌شود. profile_next() اجرای درخواست بعدی را
+# با cProfile یا tracemalloc ثبت می‌کند.
+#
+#   with default_metrics.stage('summarize_farsi.normalize'):
+#       ...
+import functools
+import io
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+
+
+# مرزهای هیستوگرام بر حسب ثانیه (مثل پیش‌فرض‌های Prometheus، با دقت بیشتر در زیر میلی‌ثانیه)
+BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+PROFILERS = ('cprofile', 'tracemalloc')
+
+_NULL = nullcontext()
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    # تخمین صدک از روی مرز بالای سطل (برای گزارش JSON)
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum_ms': self.sum * 1000,
+            'mean_ms': self.sum * 1000 / self.count if self.count else 0.0,
+            'p50_ms': self.quantile(0.5) * 1000,
+            'p99_ms': self.quantile(0.99) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+
+class _Stage:
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    def __init__(self, enabled=False, prefix="underfeel"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self.stages = {}       # نام مرحله -> Histogram
+        self.counters = {}     # (نام، برچسب‌ها) -> تعداد
+        self.sources = {}      # نام -> (تابع آمار، نام برچسب)
+        self.lock = threading.Lock()
+        self.profile_kind = None
+        self.last_profile = None
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def reset(self):
+        with self.lock:
+            self.stages.clear()
+            self.counters.clear()
+
+    def observe(self, name, seconds):
+        with self.lock:
+            histogram = self.stages.get(name)
+            if histogram is None:
+                histogram = self.stages[name] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    # آماری که بیرون از Metrics نگه داشته می‌شود (مثل کش‌های TextPipeline) و هنگام
+    # خروجی گرفتن خوانده می‌شود؛ fn باید {مقدار برچسب: {فیلد: عدد}} برگرداند
+    def add_source(self, name, fn, label):
+        self.sources[name] = (fn, label)
+
+    # زمان‌سنجی یک مرحله: with metrics.stage('name'): ...
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL
+        return _Stage(self, name)
+
+    # مثل stage، ولی اگر ثبت پروفایل درخواست شده باشد همین اجرا پروفایل می‌شود.
+    # برای نقطه‌های ورود (پاسخ چت‌بات، خلاصه‌سازی، تحلیل احساسات) استفاده می‌شود.
+    def request(self, name):
+        if self.profile_kind is None:
+            return self.stage(name)
+        with self.lock:
+            kind, self.profile_kind = self.profile_kind, None
+        if kind is None:
+            return self.stage(name)
+        return self._profiled(name, kind)
+
+    # دکوراتور زمان‌سنجی کل یک تابع
+    def timed(self, name, request=False):
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled and (not request or self.profile_kind is None):
+                    return fn(*args, **kwargs)
+                with (self.request(name) if request else self.stage(name)):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # ---------------------------------------------------------------- پروفایل
+
+    def profile_next(self, kind='cprofile'):
+        if kind not in PROFILERS:
+            raise ValueError(f"unknown profiler: {kind} (expected one of {', '.join(PROFILERS)})")
+        self.profile_kind = kind
+
+    @contextmanager
+    def _profiled(self, name, kind, limit=30):
+        if kind == 'cprofile':
+            import cProfile
+            import pstats
+            profiler = cProfile.Profile()
+            with self.stage(name):
+                profiler.enable()
+                try:
+                    yield
+                finally:
+                    profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+            self.last_profile = {'name': name, 'kind': kind, 'report': out.getvalue()}
+        else:
+            import tracemalloc
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            try:
+                with self.stage(name):
+                    yield
+            finally:
+                after = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                if started:
+                    tracemalloc.stop()
+            lines = [str(stat) for stat in after.compare_to(before, 'lineno')[:limit]]
+            self.last_profile = {
+                'name': name, 'kind': kind, 'peak_bytes': peak, 'report': "\n".join(lines),
+            }
+
+    # ---------------------------------------------------------------- خروجی
+
+    def to_dict(self):
+        with self.lock:
+            stages = {name: h.to_dict() for name, h in sorted(self.stages.items())}
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+        result = {'stages': stages, 'counters': counters}
+        for name, (fn, _) in sorted(self.sources.items()):
+            result[name] = fn()
+        if self.last_profile is not None:
+            result['profile'] = self.last_profile
+        return result
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+    # فرمت متنی Prometheus (زمان‌ها بر حسب ثانیه)
+    def to_prometheus(self):
+        metric = f"{self.prefix}_stage_seconds"
+        lines = [f"# HELP {metric} Time spent in each named stage.", f"# TYPE {metric} histogram"]
+        with self.lock:
+            for name, h in sorted(self.stages.items()):
+                label = f'stage="{_escape(name)}"'
+                total = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    total += count
+                    lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {total}')
+                lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {h.count}')
+                lines.append(f"{metric}_sum{{{label}}} {h.sum}")
+                lines.append(f"{metric}_count{{{label}}} {h.count}")
+
+            seen = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                counter = f"{self.prefix}_{name}_total"
+                if counter not in seen:
+                    seen.add(counter)
+                    lines.append(f"# TYPE {counter} counter")
+                label = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels)
+                lines.append(f"{counter}{{{label}}} {value}" if label else f"{counter} {value}")
+
+        for name, (fn, label) in sorted(self.sources.items()):
+            samples = {}
+            for key, fields in fn().items():
+                for field, value in fields.items():
+                    samples.setdefault(field, []).append((key, value))
+            for field, values in samples.items():
+                gauge = f"{self.prefix}_{name}_{field}"
+                lines.append(f"# TYPE {gauge} gauge")
+                lines.extend(f'{gauge}{{{label}="{_escape(str(key))}"}} {value}' for key, value in values)
+        return "\n".join(lines) + "\n"
+
+    # نوشتن در فایل؛ پسوند .prom یا .txt فرمت Prometheus و بقیه JSON
+    def write(self, path):
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+default_metrics = Metrics(enabled=os.environ.get("UNDERFEEL_METRICS") == "1")
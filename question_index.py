@@ -0,0 +1,509 @@
+# ایندکس سوالات پایگاه دانش برای پیدا کردن سریع پاسخ
+# سه قانون تطبیق ChatBot.get_response (دقیق، جزئی، حداقل سه کلمه مشترک)
+# با همان ترتیب و همان نتیجه، ولی بدون پیمایش خطی کل سوالات اجرا می‌شوند.
+import math
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+
+from knowledge_base import PostingTable, StringTable
+from text_pipeline import canonical_key
+
+
+# نرمال‌سازی سوال (همان strip و lower قبلی به همراه یکسان‌سازی حروف عربی/فارسی)
+def normalize_question(text):
+    return canonical_key(text)
+
+
+# نمای مرتب کلیدها برای جستجوی دودویی در بخش ثابت (بارگذاری‌شده از فایل باینری)
+class _SortedKeys:
+    __slots__ = ('keys', 'order')
+
+    def __init__(self, keys, order):
+        self.keys = keys
+        self.order = order
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, i):
+        return self.keys[self.order[i]]
+
+    # اندیس key در جدول اصلی یا None
+    def find(self, key):
+        if not len(self.order):
+            return None
+        i = bisect_left(self, key)
+        if i < len(self.order) and self[i] == key:
+            return self.order[i]
+        return None
+
+
+class QuestionIndex:
+    # طول n-gram های کاراکتری برای جستجوی جزئی
+    NGRAM = 3
+    # حداقل تعداد کلمه مشترک برای تطبیق کلمه‌ای
+    MIN_COMMON_WORDS = 3
+
+    # questions متن سوال‌هاست؛ sections بخش‌های ایندکس از فایل باینری .kb است
+    def __init__(self, questions=None, sections=None):
+        if sections is not None:
+            self.keys = StringTable.from_sections(sections, 'index.keys')
+            self.sorted_keys = _SortedKeys(self.keys, sections['index.exact_order'])
+            self.ngrams = PostingTable.from_sections(sections, 'index.ngrams')
+            self.words = PostingTable.from_sections(sections, 'index.words')
+        else:
+            self.keys = StringTable()        # سوال نرمال‌شده به ترتیب درج
+            self.sorted_keys = _SortedKeys(self.keys, ())
+            self.ngrams = PostingTable()     # n-gram -> لیست صعودی اندیس‌ها
+            self.words = PostingTable()      # کلمه -> لیست صعودی اندیس‌ها
+        self.exact = {}       # سوال نرمال‌شده -> اولین اندیس (سوال‌های خارج از بخش ثابت)
+        for question in questions or ():
+            self.add(question)
+
+    def __len__(self):
+        return len(self.keys)
+
+    # اضافه کردن یک سوال جدید به انتهای ایندکس (به‌روزرسانی افزایشی)
+    def add(self, question):
+        idx = len(self.keys)
+        key = normalize_question(question)
+        self.keys.append(key)
+        if self.sorted_keys.find(key) is None:
+            self.exact.setdefault(key, idx)
+
+        for gram in set(self._ngrams(key)):
+            self.ngrams.add(gram, idx)
+
+        for word in set(key.split()):
+            self.words.add(word, idx)
+        return idx
+
+    def _ngrams(self, key):
+        n = self.NGRAM
+        return (key[i:i + n] for i in range(len(key) - n + 1))
+
+    # جستجوی دقیق
+    def find_exact(self, query):
+        key = normalize_question(query)
+        idx = self.sorted_keys.find(key)
+        return self.exact.get(key) if idx is None else idx
+
+    # جستجوی جزئی: اولین سوالی که متن کاربر داخل آن باشد
+    def find_substring(self, query):
+        query = normalize_question(query)
+        if len(query) < self.NGRAM:
+            # برای متن‌های خیلی کوتاه n-gram نداریم، مستقیما در بافر کلیدها جستجو می‌شود
+            return self.keys.find_containing(query)
+
+        postings = []
+        for gram in set(self._ngrams(query)):
+            posting = self.ngrams.get(gram)
+            if not posting:
+                return None
+            postings.append(posting)
+
+        # کوتاه‌ترین لیست به ترتیب صعودی بررسی می‌شود تا اولین تطبیق پیدا شود
+        keys = self.keys
+        for idx in min(postings, key=len):
+            if query in keys[idx]:
+                return idx
+        return None
+
+    # تطبیق کلمه‌ای: اولین سوالی که حداقل سه کلمه مشترک با متن کاربر دارد
+    def find_common_words(self, query):
+        user_words = set(normalize_question(query).split())
+        if len(user_words) < self.MIN_COMMON_WORDS:
+            return None
+
+        counts = {}
+        best = None
+        for word in user_words:
+            for idx in self.words.get(word, ()):
+                if best is not None and idx >= best:
+                    break
+                count = counts.get(idx, 0) + 1
+                counts[idx] = count
+                if count >= self.MIN_COMMON_WORDS:
+                    best = idx
+        return best
+
+    # بخش‌های ایندکس برای نوشتن در فایل باینری (کلیدها، ترتیب مرتب و لیست‌های ارجاع)
+    def sections(self):
+        keys = self.keys
+        order = array('I', sorted(range(len(keys)), key=keys.__getitem__))
+        return {
+            **keys.sections('index.keys'),
+            'index.exact_order': order,
+            **self.ngrams.sections('index.ngrams'),
+            **self.words.sections('index.words'),
+        }
+
+    # سه قانون تطبیق به همان ترتیب get_response قدیمی: (نام، تابع)
+    def tiers(self):
+        return (
+            ('exact', self.find_exact),
+            ('substring', self.find_substring),
+            ('common_words', self.find_common_words),
+        )
+
+    def lookup(self, query):
+        return self.lookup_tier(query)[0]
+
+    # (اندیس، نام قانونی که جواب داد) یا (None, None)
+    def lookup_tier(self, query):
+        for tier, find in self.tiers():
+            idx = find(query)
+            if idx is not None:
+                return idx, tier
+        return None, None
+
+
+_DTYPES = {'q': 'int64', 'i': 'int32', 'd': 'float64', 'f': 'float32'}
+
+
+# آرایه NumPy به array با typecode داده‌شده (برای write_sections)
+def _array(typecode, values):
+    result = array(typecode)
+    result.frombytes(values.astype(_DTYPES[typecode], copy=False).tobytes())
+    return result
+
+
+# ایندکس فازی: بردار TF-IDF از n-gram های کاراکتری هر سوال
+# امتیاز یک متن در برابر همه سوالات با یک ضرب ماتریس اسپارس حساب می‌شود.
+# چون روی کاراکترها کار می‌کند برای فارسی و انگلیسی به یک شکل جواب می‌دهد.
+# هر کاراکتر یک رقم در مبنای BASE است و هر n-gram یک عدد ۶۴ بیتی، پس شمردن n-gram ها
+# هنگام ساخت با NumPy انجام می‌شود. ماتریس اصلی در اولین استفاده (warm_up یا اولین جستجو)
+# ساخته یا از فایل خوانده می‌شود تا NumPy و SciPy در مسیر بالا آمدن برنامه نباشند؛ سوال‌های
+# اضافه‌شده بعد از آن در یک ماتریس کوچک جدا (delta) با IDF همان ماتریس اصلی وزن می‌گیرند
+# و کنار آن جستجو می‌شوند. compact (هنگام فشرده‌سازی ذخیره) این دو را یکی و IDF را
+# دوباره حساب می‌کند.
+class FuzzyIndex:
+    NGRAM_RANGE = (2, 4)
+    BASE = 1 << 15
+    # تعداد سوالی که هنگام ساخت با هم شمرده می‌شوند (سقف حافظه موقت)
+    CHUNK = 20_000
+
+    # keys جدول سوال‌های نرمال‌شده (مثلا QuestionIndex.keys) تا دوباره نرمال نشوند؛
+    # sections بخش‌های فایل باینری .kb است (ماتریس بدون ساخت دوباره با mmap خوانده می‌شود)
+    def __init__(self, questions=None, keys=None, sections=None):
+        # کاراکتر -> رقم (از ۱)؛ کاراکترهای بعد از BASE-2 تای اول رقم آخر را با هم شریک می‌شوند
+        self.alphabet = {}
+        self.terms = None                # کد n-gram های ماتریس اصلی به ترتیب صعودی (جای هر کد = ستون آن)
+        self.matrix = None               # ماتریس CSC (سطر: سوال، ستون: n-gram) با سطرهای نرمال‌شده
+        self.idf = None
+        self.norms = None                # طول بردار هر سطر پیش از نرمال شدن (برای compact)
+        # سطرهای اضافه‌شده بعد از ساخت ماتریس اصلی به صورت سه‌تایی (سطر، ستون، tf)؛
+        # n-gram هایی که در ماتریس اصلی نیستند ستون‌های بعد از ستون‌های آن را می‌گیرند
+        self.new_terms = {}
+        self.delta_rows = array('i')
+        self.delta_cols = array('i')
+        self.delta_tf = array('f')
+        self.delta_size = 0
+        self.delta = None                # ماتریس CSC سطرهای جدید، تا جستجوی بعدی ساخته نمی‌شود
+        self._lock = threading.Lock()
+        # (تابع ساخت، ورودی آن) تا اولین استفاده؛ سوال‌هایی که پیش از آن اضافه می‌شوند
+        # در _queued می‌مانند و بعد از ساخت ماتریس اصلی به delta می‌روند
+        self._queued = []
+        if sections is not None:
+            self.size = len(sections['fuzzy.norms'])
+            self._pending = (self._load, sections)
+        else:
+            if keys is None:
+                keys = [normalize_question(question) for question in questions or ()]
+            # keys ممکن است جدول زنده QuestionIndex باشد؛ فقط سوال‌های فعلی آن ساخته می‌شوند
+            self.size = len(keys)
+            self._pending = (self._build, keys)
+
+    def __len__(self):
+        return self.size + self.delta_size + len(self._queued)
+
+    # ساخت یا خواندن ماتریس اصلی در اولین استفاده (زیر قفل صدا زده می‌شود)
+    def _ensure(self):
+        if self._pending is None:
+            return
+        build, source = self._pending
+        build(source)
+        self._pending = None
+        for key in self._queued:
+            self._append(self._grams(key))
+        self._queued = []
+
+    def _grams(self, key):
+        padded = f" {key} "
+        low, high = self.NGRAM_RANGE
+        return Counter([
+            padded[i:i + n]
+            for n in range(low, high + 1)
+            for i in range(len(padded) - n + 1)
+        ])
+
+    def _digit(self, ch):
+        digit = self.alphabet.get(ch)
+        if digit is None:
+            digit = self.alphabet[ch] = min(len(self.alphabet) + 1, self.BASE - 1)
+        return digit
+
+    # کد یک n-gram؛ None اگر کاراکتری از آن تا حالا دیده نشده باشد (و extend خاموش باشد)
+    def _code(self, gram, extend=False):
+        code = 0
+        for ch in gram:
+            digit = self._digit(ch) if extend else self.alphabet.get(ch)
+            if digit is None:
+                return None
+            code = code * self.BASE + digit
+        return code
+
+    # ستون هر کد در ماتریس اصلی یا -1
+    def _columns(self, codes):
+        import numpy as np
+
+        codes = np.array([-1 if code is None else code for code in codes], dtype=np.int64)
+        terms = self.terms
+        if not len(terms):
+            return np.full(len(codes), -1)
+        cols = np.searchsorted(terms, codes)
+        found = terms[np.minimum(cols, len(terms) - 1)] == codes
+        return np.where(found, cols, -1)
+
+    # IDF یک n-gram که در هیچ سوال ماتریس اصلی نیامده
+    def _max_idf(self):
+        return math.log(1.0 + self.size) + 1.0
+
+    # اضافه کردن سوال جدید به delta (ماتریس اصلی دوباره ساخته نمی‌شود)
+    def add(self, question):
+        key = normalize_question(question)
+        with self._lock:
+            if self._pending is not None:
+                self._queued.append(key)
+            else:
+                self._append(self._grams(key))
+            return len(self) - 1
+
+    def _append(self, grams):
+        codes = [self._code(gram, extend=True) for gram in grams]
+        base_terms = len(self.terms)
+        for code, col, count in zip(codes, self._columns(codes).tolist(), grams.values()):
+            if col < 0:
+                col = base_terms + self.new_terms.setdefault(code, len(self.new_terms))
+            self.delta_cols.append(col)
+            self.delta_tf.append(1.0 + math.log(count))
+        self.delta_rows.extend([self.delta_size] * len(grams))
+        self.delta_size += 1
+        self.delta = None
+
+    # ساخت ماتریس اصلی و ماتریس سطرهای جدید پیش از اولین جستجو
+    def warm_up(self):
+        with self._lock:
+            self._ensure()
+            if self.delta is None and self.delta_size:
+                self.delta = self._delta_matrix()
+
+    # ساخت ماتریس اصلی از سوال‌های نرمال‌شده
+    def _build(self, keys):
+        import numpy as np
+
+        parts = []
+        batch = []
+        n_docs = 0
+        for key in islice(keys, self.size):
+            batch.append(key)
+            if len(batch) == self.CHUNK:
+                parts.append(self._count(batch, n_docs))
+                n_docs += len(batch)
+                batch = []
+        if batch:
+            parts.append(self._count(batch, n_docs))
+            n_docs += len(batch)
+        if parts:
+            rows, local, counts, uniques = zip(*parts)
+            # کدهای هر دسته جدا یکتا شده‌اند؛ ستون نهایی جای کد در اجتماع آن‌هاست
+            self.terms = np.unique(np.concatenate(uniques))
+            cols = np.concatenate([np.searchsorted(self.terms, u).astype(np.int32)[c]
+                                   for u, c in zip(uniques, local)])
+            rows, counts = np.concatenate(rows), np.concatenate(counts)
+        else:
+            self.terms = np.empty(0, dtype=np.int64)
+            rows = cols = np.empty(0, dtype=np.int32)
+            counts = np.empty(0, dtype=np.int64)
+        tf = 1.0 + np.log(counts.astype(np.float32))
+        self._weigh(rows, cols, tf, n_docs)
+
+    def _load(self, sections):
+        import numpy as np
+        from scipy.sparse import csc_matrix
+
+        alphabet = np.frombuffer(sections['fuzzy.alphabet'], dtype=np.uint32)
+        for code_point in alphabet.tolist():
+            self._digit(chr(code_point))
+        self.terms = np.frombuffer(sections['fuzzy.terms'], dtype=np.int64)
+        self.idf = np.frombuffer(sections['fuzzy.idf'], dtype=np.float64)
+        self.norms = np.frombuffer(sections['fuzzy.norms'], dtype=np.float32)
+        self.size = len(self.norms)
+        self.matrix = csc_matrix((
+            np.frombuffer(sections['fuzzy.data'], dtype=np.float32),
+            np.frombuffer(sections['fuzzy.indices'], dtype=np.int32),
+            np.frombuffer(sections['fuzzy.indptr'], dtype=np.int32),
+        ), shape=(self.size, len(self.terms)))
+
+    # بخش‌های ماتریس برای نوشتن در فایل باینری (بعد از ادغام سطرهای جدید)
+    def sections(self):
+        self.compact()
+        with self._lock:
+            self._ensure()
+            matrix = self.matrix
+            return {
+                'fuzzy.alphabet': array('I', map(ord, self.alphabet)),
+                'fuzzy.terms': _array('q', self.terms),
+                'fuzzy.idf': _array('d', self.idf),
+                'fuzzy.norms': _array('f', self.norms),
+                'fuzzy.indptr': _array('i', matrix.indptr),
+                'fuzzy.indices': _array('i', matrix.indices),
+                'fuzzy.data': _array('f', matrix.data),
+            }
+
+    # (سطر، ستون در کدهای یکتای دسته، تعداد، کدهای یکتا) برای یک دسته سوال با عملیات
+    # برداری روی کل متن دسته
+    def _count(self, keys, first_row):
+        import numpy as np
+
+        padded = [f" {key} " for key in keys]
+        points = np.frombuffer("".join(padded).encode('utf-32-le'), dtype=np.uint32)
+        row = np.repeat(np.arange(first_row, first_row + len(keys), dtype=np.int32),
+                        [len(text) for text in padded])
+        chars = np.unique(points)
+        digits = np.array([self._digit(chr(c)) for c in chars.tolist()], dtype=np.int64)
+        digits = digits[np.searchsorted(chars, points)]
+
+        rows, codes = [], []
+        low, high = self.NGRAM_RANGE
+        for n in range(low, high + 1):
+            m = len(digits) - n + 1
+            if m <= 0:
+                continue
+            code = digits[:m].copy()
+            for j in range(1, n):
+                code = code * self.BASE + digits[j:j + m]
+            # n-gram نباید از مرز دو سوال رد شود
+            valid = row[:m] == row[n - 1:n - 1 + m]
+            rows.append(row[:m][valid])
+            codes.append(code[valid])
+        rows, codes = np.concatenate(rows), np.concatenate(codes)
+
+        # (سطر، کد) در یک عدد ۶۴ بیتی تا شمردن با یک مرتب‌سازی ساده انجام شود
+        uniques, local = np.unique(codes, return_inverse=True)
+        shift = max(1, int(len(uniques)).bit_length())
+        pairs, counts = np.unique(((rows - first_row).astype(np.int64) << shift) | local, return_counts=True)
+        rows = (pairs >> shift).astype(np.int32) + first_row
+        local = (pairs & ((1 << shift) - 1)).astype(np.int32)
+        return rows, local, counts, uniques
+
+    # وزن‌دهی TF-IDF و نرمال کردن سطرها با عملیات برداری
+    def _weigh(self, rows, cols, tf, n_docs):
+        import numpy as np
+        from scipy.sparse import csc_matrix
+
+        n_terms = len(self.terms)
+        df = np.bincount(cols, minlength=n_terms)
+        self.idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+
+        weights = tf * self.idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n_docs))
+        norms[norms == 0] = 1.0
+        data = (weights / norms[rows]).astype(np.float32)
+        self.norms = norms.astype(np.float32)
+        self.matrix = csc_matrix((data, (rows, cols)), shape=(n_docs, n_terms))
+        self.size = n_docs
+
+    # سطرهای جدید با IDF ماتریس اصلی؛ n-gram های جدید IDF یک n-gram دیده‌نشده را می‌گیرند
+    def _delta_matrix(self):
+        import numpy as np
+        from scipy.sparse import csc_matrix
+
+        rows = np.array(self.delta_rows, dtype=np.int32)
+        cols = np.array(self.delta_cols, dtype=np.int32)
+        idf = np.concatenate([self.idf, np.full(len(self.new_terms), self._max_idf())])
+        weights = np.array(self.delta_tf, dtype=np.float32) * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=self.delta_size))
+        norms[norms == 0] = 1.0
+        data = (weights / norms[rows]).astype(np.float32)
+        return csc_matrix((data, (rows, cols)), shape=(self.delta_size, len(idf)))
+
+    # ادغام سطرهای جدید در ماتریس اصلی و محاسبه دوباره IDF
+    def compact(self):
+        import numpy as np
+
+        with self._lock:
+            self._ensure()
+            if not self.delta_size:
+                return
+            base = self.matrix.tocoo()
+            # وزن‌های نرمال‌شده ماتریس اصلی دوباره به tf برگردانده می‌شوند
+            base_tf = base.data * self.norms[base.row] / self.idf[base.col]
+            rows = np.concatenate([base.row, np.array(self.delta_rows, dtype=np.int32) + self.size])
+            cols = np.concatenate([base.col, np.array(self.delta_cols, dtype=np.int32)])
+            tf = np.concatenate([base_tf, np.array(self.delta_tf, dtype=np.float32)])
+
+            # ستون‌های n-gram های جدید بین ستون‌های قبلی (به ترتیب کد) جا می‌گیرند
+            codes = np.concatenate([self.terms, np.fromiter(self.new_terms, dtype=np.int64,
+                                                            count=len(self.new_terms))])
+            order = np.argsort(codes)
+            remap = np.empty(len(codes), dtype=np.int32)
+            remap[order] = np.arange(len(codes), dtype=np.int32)
+            self.terms = codes[order]
+            self._weigh(rows.astype(np.int32), remap[cols], tf, self.size + self.delta_size)
+
+            self.new_terms = {}
+            self.delta_rows, self.delta_cols, self.delta_tf = array('i'), array('i'), array('f')
+            self.delta_size = 0
+            self.delta = None
+
+    # k سوال نزدیک به متن کاربر با امتیاز شباهت کسینوسی (بزرگ‌تر یا مساوی threshold)
+    def search(self, query, k=5, threshold=0.0):
+        import numpy as np
+
+        grams = self._grams(normalize_question(query))
+        # بردار متن کاربر زیر قفل ساخته می‌شود تا با add همزمان شماره ستون‌ها جابه‌جا نشوند
+        with self._lock:
+            self._ensure()
+            if self.delta is None and self.delta_size:
+                self.delta = self._delta_matrix()
+            matrix, delta, idf = self.matrix, self.delta, self.idf
+            base_terms = len(idf)
+            max_idf = self._max_idf()
+            codes = [self._code(gram) for gram in grams]
+            cols, weights = [], []
+            norm = 0.0
+            for code, col, count in zip(codes, self._columns(codes).tolist(), grams.values()):
+                tf = 1.0 + math.log(count)
+                if col < 0:
+                    # n-gram ناشناخته در ماتریس اصلی فقط در طول بردار متن کاربر اثر دارد
+                    weight = tf * max_idf
+                    new = self.new_terms.get(code)
+                    if new is not None:
+                        cols.append(base_terms + new)
+                        weights.append(weight)
+                else:
+                    weight = tf * idf[col]
+                    cols.append(col)
+                    weights.append(weight)
+                norm += weight * weight
+        if not cols:
+            return []
+
+        cols = np.asarray(cols, dtype=np.int32)
+        weights = np.asarray(weights, dtype=np.float32) / np.float32(math.sqrt(norm))
+        known = cols < base_terms
+        scores = matrix[:, cols[known]] @ weights[known]
+        if delta is not None:
+            scores = np.concatenate([scores, delta[:, cols] @ weights])
+
+        candidates = np.flatnonzero(scores >= max(threshold, 1e-9))
+        if len(candidates) > k:
+            top = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[top]
+        # مرتب‌سازی بر اساس امتیاز نزولی و در صورت برابری بر اساس ترتیب درج
+        order = np.lexsort((candidates, -scores[candidates]))
+        return [(int(candidates[i]), float(scores[candidates[i]])) for i in order]
@@ -0,0 +1,118 @@
+# کش پاسخ‌های چت‌بات (LRU با زمان انقضا)
+# کلید، متن نرمال‌شده کاربر است و جواب‌های منفی («بلد نیستم») هم نگه داشته می‌شوند.
+# هر تغییر در پایگاه دانش (یادگیری یا بارگذاری دوباره) شماره نسل را بالا می‌برد؛
+# رکوردهای نسل قبلی دیگر برگردانده نمی‌شوند و در اولین برخورد حذف می‌شوند.
+import threading
+import time
+from collections import OrderedDict
+
+
+# نشانه نبودن در کش (چون None خودش یک جواب معتبر است)
+MISS = object()
+
+
+class ResponseCache:
+    # حداکثر تعداد رکورد و مجموع طول کلیدها و پاسخ‌ها (کاراکتر)
+    MAX_ENTRIES = 10_000
+    MAX_SIZE = 4_000_000
+    # عمر هر رکورد به ثانیه (None یعنی بدون انقضا)
+    TTL = 600.0
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_size=MAX_SIZE, ttl=TTL,
+                 cache_negative=True, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+        self.cache_negative = cache_negative
+        self.clock = clock
+        self.generation = 0
+        self.size = 0
+        self.items = OrderedDict()    # کلید -> (پاسخ، نسل، زمان انقضا، اندازه)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    # باطل کردن همه رکوردهای فعلی بعد از تغییر پایگاه دانش
+    def bump(self):
+        with self.lock:
+            self.generation += 1
+            return self.generation
+
+    # پاسخ ذخیره‌شده یا MISS
+    def get(self, key):
+        if not self.max_entries:
+            return MISS
+        with self.lock:
+            entry = self.items.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISS
+            answer, generation, expires, _ = entry
+            if generation != self.generation:
+                self.stale += 1
+                self.misses += 1
+                self._remove(key)
+                return MISS
+            if expires is not None and self.clock() >= expires:
+                self.expired += 1
+                self.misses += 1
+                self._remove(key)
+                return MISS
+            self.items.move_to_end(key)
+            self.hits += 1
+            if answer is None:
+                self.negative_hits += 1
+            return answer
+
+    # generation نسلی است که پاسخ بر اساس آن حساب شده؛ اگر در این فاصله
+    # پایگاه دانش تغییر کرده باشد پاسخ ذخیره نمی‌شود
+    def put(self, key, answer, generation=None):
+        if not self.max_entries or (answer is None and not self.cache_negative):
+            return
+        size = len(key) + (len(answer) if answer else 0)
+        if size > self.max_size:
+            return
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self.items:
+                self._remove(key)
+            self.items[key] = (answer, self.generation, expires, size)
+            self.size += size
+            while len(self.items) > self.max_entries or self.size > self.max_size:
+                _, (_, _, _, evicted) = self.items.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def _remove(self, key):
+        self.size -= self.items.pop(key)[3]
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.size = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'stale': self.stale,
+            'expired': self.expired,
+            'evictions': self.evictions,
+            'entries': len(self.items),
+            'size': self.size,
+            'max_entries': self.max_entries,
+            'max_size': self.max_size,
+            'generation': self.generation,
+        }
@@ -0,0 +1,321 @@
+# سرور HTTP بدون رابط گرافیکی برای چت‌بات، تحلیل احساسات و خلاصه‌سازی
+# با asyncio نوشته شده و اتصال‌ها keep-alive هستند. کارهای سنگین (خلاصه‌سازی و
+# تحلیل احساسات) در یک ProcessPool اجرا می‌شوند و درخواست‌های تحلیل احساسات
+# که همزمان می‌رسند با هم در یک دسته به کارگرها فرستاده می‌شوند. پاسخ دادن و
+# یادگیری چت‌بات در یک رشته جدا و به ترتیب اجرا می‌شوند تا نوشتن در پایگاه دانش
+# همزمان با خواندن آن نباشد.
+#
+#   python chatbot.py --serve --port 8080
+#   curl -d '{"text": "سلام"}' localhost:8080/respond
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from emotion import EmotionClassifier
+from emotion_batch import init_worker, score_chunk
+from metrics import default_metrics, PROFILERS
+from Summary import FARSI_METHODS, summarize_auto
+
+
+MAX_BODY = 10 * 1024 * 1024
+# زمان بیکاری مجاز یک اتصال keep-alive (ثانیه)
+KEEPALIVE_TIMEOUT = 15
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+
+# پاسخ متنی به جای JSON (برای /metrics)
+class PlainText(str):
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# close=True یعنی بدنه درخواست خوانده نشده و اتصال بعد از پاسخ بسته می‌شود
+class HttpError(Exception):
+    def __init__(self, status, message, close=False):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.close = close
+
+
+# جمع کردن درخواست‌های همزمان تحلیل احساسات در یک دسته
+class EmotionBatcher:
+    def __init__(self, pool, max_batch=256, max_delay=0.005):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = asyncio.Queue()
+        self.task = None
+        # ارجاع به دسته‌های در حال اجرا تا task ها پیش از تمام شدن جمع‌آوری نشوند
+        self.dispatches = set()
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def score(self, texts):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            count = len(batch[0][0])
+            deadline = loop.time() + self.max_delay
+            while count < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                count += len(item[0])
+            task = loop.create_task(self.dispatch(batch))
+            self.dispatches.add(task)
+            task.add_done_callback(self.dispatches.discard)
+
+    async def dispatch(self, batch):
+        texts = [text for item_texts, _ in batch for text in item_texts]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.pool, score_chunk, texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        start = 0
+        for item_texts, future in batch:
+            if not future.done():
+                future.set_result(results[start:start + len(item_texts)])
+            start += len(item_texts)
+
+
+class UnderFeelServer:
+    def __init__(self, bot, dataset_path, workers=None, policy='split', reload=False, matcher='automaton'):
+        self.bot = bot
+        self.dataset_path = dataset_path
+        self.matcher = matcher
+        # کارگرها دیتاست احساسات را بعد از تغییر دوباره بخوانند
+        self.reload = reload
+        self.workers = workers or os.cpu_count()
+        self.policy = policy
+        # یک رشته برای همه کارهای پایگاه دانش: یادگیری‌ها به ترتیب انجام می‌شوند
+        self.bot_executor = ThreadPoolExecutor(1, thread_name_prefix="chatbot")
+        self.pool = None
+        self.batcher = None
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('POST', '/respond'): self.respond,
+            ('POST', '/learn'): self.learn,
+            ('POST', '/emotion'): self.emotion,
+            ('POST', '/summarize'): self.summarize,
+            ('GET', '/metrics'): self.metrics,
+            ('GET', '/metrics.json'): self.metrics_json,
+            ('GET', '/profile'): self.profile,
+            ('POST', '/profile'): self.profile_next,
+        }
+
+    async def start(self, host, port):
+        # ساخت کش دیتاست احساسات پیش از بالا آمدن کارگرها
+        cache_path = EmotionClassifier(self.dataset_path, policy=self.policy, matcher=self.matcher).cache_path
+        self.pool = ProcessPoolExecutor(self.workers, initializer=init_worker,
+                                        initargs=(self.dataset_path, cache_path, self.policy, self.reload,
+                                                  self.matcher))
+        self.batcher = EmotionBatcher(self.pool)
+        self.batcher.start()
+        # ایندکس فازی و مسیر پاسخ‌دهی پیش از پذیرفتن اولین اتصال آماده می‌شوند
+        await asyncio.get_running_loop().run_in_executor(self.bot_executor, self.bot.warm_up)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        if self.batcher and self.batcher.task:
+            self.batcher.task.cancel()
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+        self.bot_executor.shutdown()
+        self.bot.close()
+
+    # ---------------------------------------------------------------- endpoints
+
+    async def health(self, body):
+        return {'status': 'ok'}
+
+    async def respond(self, body):
+        text = _require_text(body, 'text')
+        loop = asyncio.get_running_loop()
+        answer = await loop.run_in_executor(self.bot_executor, self.bot.get_response, text)
+        return {'answer': answer}
+
+    async def learn(self, body):
+        question = _require_text(body, 'question')
+        answer = _require_text(body, 'answer')
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.bot_executor, self.bot.learn_new_answer, question, answer)
+        return {'ok': True}
+
+    async def emotion(self, body):
+        if 'texts' in body:
+            texts = body['texts']
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                raise HttpError(400, "'texts' must be a list of strings")
+            results = await self.batcher.score(texts)
+            return {'results': [{'emotion': e, 'scores': s} for e, s in results]}
+        text = _require_text(body, 'text')
+        [(emotion, scores)] = await self.batcher.score([text])
+        return {'emotion': emotion, 'scores': scores}
+
+    async def summarize(self, body):
+        text = _require_text(body, 'text')
+        sentences = body.get('sentences', 2)
+        if not isinstance(sentences, int) or isinstance(sentences, bool) or sentences < 1:
+            raise HttpError(400, "'sentences' must be a positive integer")
+        method = body.get('method', 'frequency')
+        if method not in FARSI_METHODS:
+            raise HttpError(400, f"'method' must be one of {', '.join(FARSI_METHODS)}")
+        loop = asyncio.get_running_loop()
+        lang, summary = await loop.run_in_executor(self.pool, summarize_auto, text, sentences, method)
+        return {'language': lang, 'summary': summary}
+
+    # متن Prometheus؛ کارهایی که در ProcessPool اجرا می‌شوند فقط با زمان کل درخواست دیده می‌شوند
+    # (آمار کش‌های text_pipeline هم مال همین پروسس است، نه کارگرها)
+    async def metrics(self, body):
+        return PlainText(default_metrics.to_prometheus())
+
+    async def metrics_json(self, body):
+        return {**default_metrics.to_dict(), 'response_cache': self.bot.cache.stats()}
+
+    async def profile(self, body):
+        return {'profile': default_metrics.last_profile}
+
+    # پروفایل درخواست بعدی پاسخ‌دهی یا یادگیری (در رشته چت‌بات)
+    async def profile_next(self, body):
+        kind = body.get('kind', 'cprofile')
+        if kind not in PROFILERS:
+            raise HttpError(400, f"'kind' must be one of {', '.join(PROFILERS)}")
+        default_metrics.profile_next(kind)
+        return {'ok': True, 'kind': kind}
+
+    # ---------------------------------------------------------------- HTTP
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        asyncio.TimeoutError, ConnectionError):
+                    break
+                keep_alive = await self.handle_request(head, reader, writer)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def handle_request(self, head, reader, writer):
+        lines = head.decode('latin-1').split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            await self.send(writer, 400, {'error': "malformed request line"}, False)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == "HTTP/1.1" else connection == 'keep-alive'
+
+        try:
+            if 'transfer-encoding' in headers:
+                raise HttpError(411, "chunked bodies are not supported; send Content-Length", close=True)
+            length = headers.get('content-length', '0')
+            if not (length.isascii() and length.isdigit()):
+                raise HttpError(400, "invalid Content-Length", close=True)
+            length = int(length)
+            if length > MAX_BODY:
+                raise HttpError(413, "request body too large", close=True)
+            raw = await reader.readexactly(length) if length else b""
+            status, payload = 200, await self.dispatch(method, target.split("?", 1)[0], raw)
+        except HttpError as e:
+            status, payload = e.status, {'error': e.message}
+            keep_alive = keep_alive and not e.close
+        except asyncio.IncompleteReadError:
+            return False
+        except Exception as e:
+            status, payload = 500, {'error': str(e)}
+
+        await self.send(writer, status, payload, keep_alive)
+        return keep_alive
+
+    async def dispatch(self, method, path, raw):
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(p == path for _, p in self.routes):
+                raise HttpError(405, f"{method} not allowed on {path}")
+            raise HttpError(404, f"unknown endpoint {path}")
+        if raw:
+            try:
+                body = json.loads(raw)
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                raise HttpError(400, "body must be JSON")
+            if not isinstance(body, dict):
+                raise HttpError(400, "body must be a JSON object")
+        else:
+            body = {}
+        with default_metrics.stage('server' + path.replace('/', '.')):
+            return await handler(body)
+
+    @staticmethod
+    async def send(writer, status, payload, keep_alive):
+        if isinstance(payload, PlainText):
+            data = payload.encode('utf-8')
+            content_type = PlainText.CONTENT_TYPE
+        else:
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            content_type = "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode('latin-1') + data)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+def _require_text(body, key):
+    value = body.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise HttpError(400, f"'{key}' must be a non-empty string")
+    return value
+
+
+# اجرای سرور تا وقتی برنامه با Ctrl+C متوقف شود
+def serve(bot, dataset_path, host="127.0.0.1", port=8080, workers=None, reload=False, matcher='automaton'):
+    app = UnderFeelServer(bot, dataset_path, workers, reload=reload, matcher=matcher)
+
+    async def main():
+        server = await app.start(host, port)
+        print(f"UnderFeel server listening on http://{host}:{port}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        app.close()
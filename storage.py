@@ -0,0 +1,289 @@
+# ذخیره‌سازی پایگاه دانش به صورت اسنپ‌شات + ژورنال فقط‌افزودنی
+# اسنپ‌شات همان فایل data.json قبلی است و هر پاسخ یادگرفته‌شده فقط یک خط
+# به فایل ژورنال (JSONL) اضافه می‌کند. هنگام بارگذاری، اسنپ‌شات و بعد ژورنال
+# بازپخش می‌شوند و هر چند وقت یک بار ژورنال در اسنپ‌شات فشرده می‌شود.
+# خط اول ژورنال تعداد سوالات اسنپ‌شاتی را نگه می‌دارد که ژورنال روی آن نوشته شده؛
+# اگر برنامه بین نوشتن اسنپ‌شات و پاک کردن ژورنال قطع شود، رکوردهای تکراری رد می‌شوند.
+# اسنپ‌شات می‌تواند JSON یا فرمت باینری فشرده (پسوند .kb، با mmap باز می‌شود) باشد.
+# چند پروسس می‌توانند یک پایگاه دانش مشترک داشته باشند: هر نوشتن زیر قفل مشورتی
+# (flock روی فایل .lock) انجام می‌شود، هر پروسس رکوردهای جدید بقیه را از انتهای
+# ژورنال می‌خواند (changes) و فشرده‌سازی بعد از جمع کردن همه رکوردها با فایل موقت و
+# rename نوشته می‌شود؛ پس یادگیری‌های پروسس‌های مختلف با هم ادغام می‌شوند.
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:     # ویندوز: قفل بین پروسس‌ها در دسترس نیست
+    fcntl = None
+
+from file_watch import file_signature
+from knowledge_base import BINARY_SUFFIX, KnowledgeBase, is_binary, write_sections
+from metrics import default_metrics
+
+
+# شناسه فایل (دستگاه، inode)؛ با جایگزینی فایل با rename عوض می‌شود
+def _file_id(path):
+    signature = file_signature(path)
+    return signature and signature[:2]
+
+
+class JournaledStore:
+    # بعد از این تعداد رکورد در ژورنال، فشرده‌سازی انجام می‌شود
+    COMPACT_EVERY = 1000
+
+    def __init__(self, data_path, sync_every=1, sync_interval=0.0, compact_every=COMPACT_EVERY):
+        self.data_path = data_path
+        self.journal_path = data_path + ".journal"
+        self.lock_path = data_path + ".lock"
+        # sync_every=1 یعنی fsync بعد از هر رکورد؛ عدد بزرگ‌تر یعنی group commit
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_every = compact_every
+        self.journal_entries = 0
+        self.base_count = 0
+        self._journal = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        # وضعیت فایل‌هایی که حافظه با آن‌ها هم‌گام است
+        self.snapshot_signature = None
+        self.journal_id = None
+        self.journal_offset = 0
+        self._lock_file = None
+        self._lock_depth = 0
+        self._thread_lock = threading.RLock()
+
+    # قفل مشورتی بین پروسس‌ها (و رشته‌ها)؛ تو در تو قابل استفاده است.
+    # shared=True برای خواندن؛ داخل قفل اشتراکی نباید قفل انحصاری گرفت
+    @contextmanager
+    def locked(self, shared=False):
+        with self._thread_lock:
+            if self._lock_depth == 0 and fcntl is not None:
+                if self._lock_file is None:
+                    self._lock_file = open(self.lock_path, 'ab')
+                fcntl.flock(self._lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    # فرمت اسنپ‌شاتی که نوشته می‌شود بر اساس پسوند فایل انتخاب می‌شود
+    @property
+    def binary(self):
+        return self.data_path.endswith(BINARY_SUFFIX)
+
+    # خواندن اسنپ‌شات (فایل باینری با mmap، وگرنه همان رفتار قبلی load_data)
+    def read_snapshot(self):
+        if is_binary(self.data_path):
+            return KnowledgeBase.open(self.data_path)
+        try:
+            with open(self.data_path, 'r', encoding='utf-8') as f:
+                return KnowledgeBase.from_dict(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return KnowledgeBase()
+
+    # بازیابی: اسنپ‌شات + بازپخش ژورنال
+    def load(self):
+        with self.locked():
+            self.snapshot_signature = file_signature(self.data_path)
+            self.journal_id = _file_id(self.journal_path)
+            self.journal_offset = 0
+            data = self.read_snapshot()
+            self.base_count = len(data)
+            self.journal_entries = 0
+            skip = 0
+            for record in self.read_journal():
+                if record.get('op') == 'base':
+                    # رکوردهایی که قبلا در اسنپ‌شات نوشته شده‌اند دوباره اضافه نمی‌شوند
+                    skip = max(0, self.base_count - record['count'])
+                    continue
+                self.journal_entries += 1
+                if skip:
+                    skip -= 1
+                    continue
+                self.apply(data, record)
+        return data
+
+    # رکوردهای ژورنال از بایت start؛ journal_offset بعد از هر رکورد جلو می‌رود.
+    # با truncate=True خط ناقص آخر بریده می‌شود (فقط در load که قفل انحصاری دارد)
+    def read_journal(self, start=0, truncate=True):
+        try:
+            f = open(self.journal_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(start)
+            valid = start
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError
+                    record = json.loads(line)
+                except ValueError:
+                    # خط ناقص آخر ژورنال (قطع شدن برنامه وسط نوشتن) بریده می‌شود
+                    # تا رکوردهای بعدی پشت آن گم نشوند
+                    f.close()
+                    if truncate:
+                        os.truncate(self.journal_path, valid)
+                    return
+                valid += len(line)
+                self.journal_offset = valid
+                yield record
+
+    # رکوردهایی که پروسس‌های دیگر بعد از آخرین خواندن اضافه کرده‌اند؛
+    # None یعنی اسنپ‌شات یا ژورنال عوض شده (فشرده‌سازی یا ویرایش دستی) و باید کامل
+    # load کرد. باید زیر locked صدا زده شود.
+    def changes(self):
+        if file_signature(self.data_path) != self.snapshot_signature:
+            return None
+        journal_id = _file_id(self.journal_path)
+        if journal_id != self.journal_id:
+            if self.journal_id is not None:
+                return None
+            # ژورنال را پروسس دیگری روی همین اسنپ‌شات ساخته است
+            self.journal_id, self.journal_offset = journal_id, 0
+        records = [
+            record for record in self.read_journal(self.journal_offset, truncate=False)
+            if record.get('op') != 'base'
+        ]
+        self.journal_entries += len(records)
+        return records
+
+    @staticmethod
+    def apply(data, record):
+        if record.get('op') == 'learn':
+            data.append(record['question'], record['answer'])
+
+    # اضافه کردن یک رکورد به ژورنال؛ رکوردهایی که پروسس‌های دیگر پیش از آن نوشته‌اند
+    # (changes) برگردانده می‌شوند تا به همین ترتیب در حافظه اضافه شوند، یا None اگر
+    # باید کامل load کرد (رکورد خود ما هم در آن خوانده می‌شود)
+    def append(self, record):
+        with self.locked():
+            foreign = self.changes()
+            journal_id = _file_id(self.journal_path)
+            if self._journal is not None and journal_id != _file_id_of(self._journal):
+                # ژورنال با فشرده‌سازی پروسس دیگری جایگزین شده است
+                self.close()
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'ab')
+                if self._journal.tell() == 0:
+                    count = self.base_count if foreign is not None else len(self.read_snapshot())
+                    self._journal.write((json.dumps({'op': 'base', 'count': count}) + "\n").encode('utf-8'))
+                if journal_id is None and foreign is not None:
+                    self.journal_id = _file_id(self.journal_path)
+            self._journal.write((json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8'))
+            # خط کامل پیش از آزاد شدن قفل به فایل می‌رسد تا بقیه خط نیمه نخوانند
+            self._journal.flush()
+            if foreign is not None:
+                self.journal_offset = self._journal.tell()
+            self._unsynced += 1
+            self.journal_entries += 1
+
+            now = time.monotonic()
+            if self._unsynced >= self.sync_every or now - self._last_sync >= self.sync_interval > 0:
+                self.sync()
+            return foreign
+
+    # نوشتن رکوردهای بافر شده روی دیسک
+    def sync(self):
+        if self._journal is None or self._unsynced == 0:
+            return
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def needs_compaction(self):
+        return self.journal_entries >= self.compact_every
+
+    # نوشتن اسنپ‌شات کامل به صورت اتمیک و خالی کردن ژورنال
+    # indexes (اختیاری) ایندکس سوالات و ایندکس فازی هستند که در فرمت باینری کنار داده‌ها
+    # نوشته می‌شوند. data باید رکوردهای پروسس‌های دیگر را هم داشته باشد (changes زیر همان قفل)
+    def write_snapshot(self, data, *indexes):
+        with self.locked():
+            self._write_snapshot(data, indexes)
+
+    def _write_snapshot(self, data, indexes):
+        tmp_path = self.data_path + ".tmp"
+        if self.binary:
+            with open(tmp_path, 'wb') as f:
+                with default_metrics.stage('save_data.write_binary'):
+                    sections = data.to_sections()
+                    for index in indexes:
+                        sections.update(index.sections())
+                    write_sections(f, sections)
+                    f.flush()
+                with default_metrics.stage('save_data.fsync'):
+                    os.fsync(f.fileno())
+        else:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                with default_metrics.stage('save_data.write_json'):
+                    json.dump(data.to_dict(), f, indent=2, ensure_ascii=False)
+                    f.flush()
+                with default_metrics.stage('save_data.fsync'):
+                    os.fsync(f.fileno())
+        os.replace(tmp_path, self.data_path)
+
+        # ژورنال با یک ژورنال خالی (فقط رکورد base) جایگزین می‌شود تا پروسس‌های دیگر
+        # با عوض شدن inode آن بفهمند که باید از اول بخوانند
+        self.close()
+        if os.path.exists(self.journal_path):
+            tmp_path = self.journal_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write((json.dumps({'op': 'base', 'count': len(data)}) + "\n").encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.journal_path)
+        self.snapshot_signature = file_signature(self.data_path)
+        self.journal_id = _file_id(self.journal_path)
+        self.journal_offset = file_signature(self.journal_path)[3] if self.journal_id else 0
+        self.journal_entries = 0
+        self.base_count = len(data)
+
+    def close(self):
+        if self._journal is not None:
+            self.sync()
+            self._journal.close()
+            self._journal = None
+
+    # بستن فایل قفل هنگام خروج از برنامه
+    def release(self):
+        self.close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+def _file_id_of(f):
+    st = os.fstat(f.fileno())
+    return (st.st_dev, st.st_ino)
+
+
+# تبدیل پایگاه دانش بین JSON و فرمت باینری (بر اساس پسوند فایل مقصد)
+#   python storage.py data.json data.kb
+#   python storage.py data.kb data.json
+def convert(source, target):
+    from question_index import FuzzyIndex, QuestionIndex
+
+    data = JournaledStore(source).load()
+    indexes = ()
+    if target.endswith(BINARY_SUFFIX):
+        index = QuestionIndex(data.question(i) for i in range(len(data)))
+        indexes = (index, FuzzyIndex(keys=index.keys))
+    JournaledStore(target).write_snapshot(data, *indexes)
+    return len(data)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3:
+        sys.exit("usage: python storage.py SOURCE TARGET  (.kb target = binary, otherwise JSON)")
+    count = convert(sys.argv[1], sys.argv[2])
+    print(f"{count} questions written to {sys.argv[2]}")
@@ -0,0 +1,160 @@
+# سرویس مشترک پردازش متن فارسی (نرمال‌سازی و توکن‌سازی)
+# اجزای hazm فقط یک بار ساخته می‌شوند و نتیجه نرمال‌سازی و توکن‌سازی در کش‌های LRU
+# با سقف اندازه (بر حسب تعداد کاراکتر) نگه داشته می‌شود. خلاصه‌ساز، تحلیل احساسات
+# و چت‌بات همگی از همین سرویس استفاده می‌کنند تا متن را به یک شکل ببینند.
+import threading
+from collections import OrderedDict
+
+from language import default_router
+from metrics import default_metrics
+
+
+# یکسان‌سازی سبک برای کلید سوالات چت‌بات (بدون hazm تا ساخت ایندکس سریع بماند):
+# حروف عربی به فارسی، ارقام فارسی/عربی به انگلیسی و حذف نیم‌فاصله
+KEY_TABLE = str.maketrans({
+    '\u064A': '\u06CC', '\u0649': '\u06CC',    # ي ى -> ی
+    '\u0643': '\u06A9',                        # ك -> ک
+    '\u200C': '',                              # نیم‌فاصله
+    **{chr(0x06F0 + i): str(i) for i in range(10)},
+    **{chr(0x0660 + i): str(i) for i in range(10)},
+})
+
+
+def canonical_key(text):
+    return text.translate(KEY_TABLE).strip().lower()
+
+
+# کش LRU که به جای تعداد، مجموع اندازه کلیدها و مقدارها را محدود می‌کند
+class SizedLRUCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self.items = OrderedDict()     # کلید -> (مقدار، اندازه)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.items.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.items.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size):
+        # مقدارهای بزرگ‌تر از کل کش (مثلا یک سند چند مگابایتی) نگه داشته نمی‌شوند
+        if size > self.max_size:
+            return
+        with self.lock:
+            old = self.items.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self.items[key] = (value, size)
+            self.size += size
+            while self.size > self.max_size:
+                _, (_, evicted) = self.items.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.size = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self.items),
+            'size': self.size,
+            'max_size': self.max_size,
+        }
+
+
+def _tokens_size(text, tokens):
+    return len(text) + sum(len(t) for t in tokens)
+
+
+class TextPipeline:
+    # سقف هر کش بر حسب تعداد کاراکتر
+    CACHE_SIZE = 4_000_000
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self._normalizer = None
+        self._sent_tokenizer = None
+        self._word_tokenizer = None
+        self._build_lock = threading.Lock()
+        self.normalize_cache = SizedLRUCache(cache_size)
+        self.sentence_cache = SizedLRUCache(cache_size)
+        self.token_cache = SizedLRUCache(cache_size)
+
+    # ساخت اجزای hazm در اولین استفاده
+    def _components(self):
+        if self._normalizer is None:
+            with self._build_lock:
+                if self._normalizer is None:
+                    from hazm import Normalizer, SentenceTokenizer, WordTokenizer
+                    self._sent_tokenizer = SentenceTokenizer()
+                    self._word_tokenizer = WordTokenizer()
+                    self._normalizer = Normalizer()
+        return self._normalizer, self._sent_tokenizer, self._word_tokenizer
+
+    def key(self, text):
+        return canonical_key(text)
+
+    # نرمال‌سازی hazm (متن تماما لاتین بدون تغییر برمی‌گردد)
+    def normalize(self, text, cache=True):
+        if cache:
+            result = self.normalize_cache.get(text)
+            if result is not None:
+                return result
+        if default_router.script(text) == 'latin':
+            result = text
+        else:
+            result = self._components()[0].normalize(text)
+        if cache:
+            self.normalize_cache.put(text, result, len(text) + len(result))
+        return result
+
+    # جمله‌های یک متن نرمال‌شده
+    def sentence_tokenize(self, text, cache=True):
+        if not cache:
+            return tuple(self._components()[1].tokenize(text))
+        result = self.sentence_cache.get(text)
+        if result is None:
+            result = tuple(self._components()[1].tokenize(text))
+            self.sentence_cache.put(text, result, _tokens_size(text, result))
+        return result
+
+    # کلمات یک متن نرمال‌شده
+    def word_tokenize(self, text, cache=True):
+        if not cache:
+            return tuple(self._components()[2].tokenize(text))
+        result = self.token_cache.get(text)
+        if result is None:
+            result = tuple(self._components()[2].tokenize(text))
+            self.token_cache.put(text, result, _tokens_size(text, result))
+        return result
+
+    def sentences(self, text):
+        return self.sentence_tokenize(self.normalize(text))
+
+    def tokens(self, text):
+        return self.word_tokenize(self.normalize(text))
+
+    # آمار کش‌ها برای تنظیم اندازه آن‌ها
+    def stats(self):
+        return {
+            'normalize': self.normalize_cache.stats(),
+            'sentences': self.sentence_cache.stats(),
+            'tokens': self.token_cache.stats(),
+        }
+
+
+default_pipeline = TextPipeline()
+# آمار کش‌ها در /metrics.json، /metrics و فایل --metrics
+default_metrics.add_source('text_pipeline', default_pipeline.stats, label='cache')
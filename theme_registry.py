@@ -0,0 +1,92 @@
+# تم‌های رنگی رابط کاربری
+# هر تم یک فایل JSON در پوشه themes است (برچسب و رنگ دکمه انتخاب و رنگ‌های تم) و همه
+# تم‌ها از قالب مشترک themes/base.qss ساخته می‌شوند. فایل‌ها یک بار خوانده و قوانین همه
+# تم‌ها در یک stylesheet ترکیبی کنار هم گذاشته می‌شوند؛ قوانین هر تم با انتخابگر
+# property (مثلا ChatUI[theme="pink"]) محدود شده‌اند. پس stylesheet فقط یک بار parse
+# می‌شود و برای تعویض تم فقط property پنجره عوض و ویجت‌ها دوباره polish می‌شوند.
+import json
+import os
+from string import Template
+
+
+THEMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "themes")
+DEFAULT_THEME = "pink"
+
+
+class Theme:
+    def __init__(self, name, label, swatch, swatch_text, colors, order=0):
+        self.name = name
+        self.label = label
+        self.swatch = swatch
+        self.swatch_text = swatch_text
+        self.colors = colors
+        self.order = order
+
+
+class ThemeRegistry:
+    # scope نام کلاس پنجره‌ای است که stylesheet روی آن نصب می‌شود
+    def __init__(self, directory=THEMES_DIR, scope="ChatUI"):
+        self.directory = directory
+        self.scope = scope
+        self._themes = None
+        self._template = None
+        self._swatch_template = None
+        self._stylesheet = None
+
+    # خواندن فایل‌ها در اولین استفاده
+    def load(self):
+        if self._themes is not None:
+            return self._themes
+        themes = []
+        for filename in os.listdir(self.directory):
+            name, ext = os.path.splitext(filename)
+            if ext != ".json":
+                continue
+            with open(os.path.join(self.directory, filename), 'r', encoding='utf-8') as f:
+                spec = json.load(f)
+            themes.append(Theme(name, spec.get('label', name), spec['swatch'], spec.get('swatch_text', 'white'),
+                                spec['colors'], spec.get('order', 0)))
+        themes.sort(key=lambda theme: (theme.order, theme.name))
+        with open(os.path.join(self.directory, "base.qss"), 'r', encoding='utf-8') as f:
+            self._template = Template(f.read())
+        with open(os.path.join(self.directory, "swatch.qss"), 'r', encoding='utf-8') as f:
+            self._swatch_template = Template(f.read())
+        self._themes = {theme.name: theme for theme in themes}
+        return self._themes
+
+    def __contains__(self, name):
+        return name in self.load()
+
+    def __iter__(self):
+        return iter(self.load().values())
+
+    def names(self):
+        return list(self.load())
+
+    def get(self, name, default=None):
+        return self.load().get(name, default)
+
+    # قوانین یک تم با انتخابگر دلخواه (پیش‌فرض: فقط همین تم)
+    def theme_stylesheet(self, name, scope=None):
+        theme = self.load()[name]
+        if scope is None:
+            scope = f'{self.scope}[theme="{name}"]'
+        return self._template.substitute(theme.colors, scope=scope)
+
+    # stylesheet ترکیبی همه تم‌ها و دکمه‌های انتخاب تم (یک بار ساخته می‌شود)
+    @property
+    def stylesheet(self):
+        if self._stylesheet is None:
+            themes = self.load()
+            parts = [self.theme_stylesheet(name) for name in themes]
+            # دکمه‌های انتخاب بعد از قوانین تم‌ها می‌آیند تا با اولویت برابر برنده شوند
+            parts.extend(
+                self._swatch_template.substitute(scope=self.scope, swatch=theme.name,
+                                                 color=theme.swatch, color_text=theme.swatch_text)
+                for theme in themes.values()
+            )
+            self._stylesheet = "\n".join(parts)
+        return self._stylesheet
+
+
+default_themes = ThemeRegistry()
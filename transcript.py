@@ -0,0 +1,172 @@
+# تاریخچه گفتگو روی دیسک (فقط‌افزودنی)
+# هر پیام یک خط JSON در فایل تاریخچه است و محل شروع هر خط (۸ بایت برای هر پیام)
+# در فایل .idx کنارش نوشته می‌شود؛ پس پیام i ام بدون خواندن کل فایل پیدا می‌شود.
+# فقط چند صفحه از پیام‌ها در حافظه کش می‌شوند، پس مصرف حافظه به طول گفتگو بستگی ندارد.
+# برای جستجو، کلمات هر پیام در یک ایندکس SQLite (فایل .search) نگه داشته می‌شوند.
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+from text_pipeline import canonical_key
+
+
+class TranscriptLog:
+    # تعداد پیام در هر صفحه و حداکثر صفحه‌های کش‌شده
+    PAGE_SIZE = 100
+    MAX_PAGES = 8
+
+    def __init__(self, path, page_size=PAGE_SIZE, max_pages=MAX_PAGES):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.search_path = path + ".search"
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages = OrderedDict()     # شماره صفحه -> لیست پیام‌ها
+        self.lock = threading.Lock()
+
+        self._recover()
+        self._log = open(self.path, 'ab')
+        self._index = open(self.index_path, 'ab')
+        self._reader = open(self.path, 'rb')
+        self._index_reader = open(self.index_path, 'rb')
+        self.count = os.path.getsize(self.index_path) // 8
+        self._open_search()
+
+    # بررسی سازگاری فایل تاریخچه و فایل offset ها بعد از قطع ناگهانی برنامه
+    def _recover(self):
+        if not os.path.exists(self.path):
+            open(self.path, 'wb').close()
+        size = os.path.getsize(self.path)
+        try:
+            index_size = os.path.getsize(self.index_path)
+        except FileNotFoundError:
+            index_size = -1
+
+        if index_size >= 0 and index_size % 8 == 0:
+            with open(self.path, 'rb') as f:
+                if index_size == 0:
+                    valid = size == 0
+                else:
+                    with open(self.index_path, 'rb') as idx:
+                        idx.seek(index_size - 8)
+                        last = int.from_bytes(idx.read(8), 'little')
+                    f.seek(last)
+                    line = f.readline()
+                    valid = line.endswith(b"\n") and last + len(line) == size
+            if valid:
+                return
+
+        # ساخت دوباره offset ها از روی فایل تاریخچه و بریدن خط ناقص آخر
+        offsets = array('Q')
+        end = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offsets.append(end)
+                end += len(line)
+        if end != size:
+            os.truncate(self.path, end)
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        with open(self.index_path, 'wb') as idx:
+            idx.write(offsets.tobytes())
+
+    def _open_search(self):
+        self.db = sqlite3.connect(self.search_path, check_same_thread=False)
+        # ایندکس جستجو از روی تاریخچه قابل بازسازی است، پس fsync لازم نیست
+        self.db.execute("PRAGMA synchronous=OFF")
+        self.db.execute("CREATE TABLE IF NOT EXISTS postings (term TEXT NOT NULL, message INTEGER NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS postings_term ON postings (term, message)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'indexed'").fetchone()
+        indexed = row[0] if row else 0
+        if indexed > self.count:
+            # تاریخچه کوتاه‌تر از ایندکس است (مثلا فایل عوض شده): ساخت دوباره
+            self.db.execute("DELETE FROM postings")
+            indexed = 0
+        with self.db:
+            for i in range(indexed, self.count):
+                self._index_message(i, self.get(i)['text'])
+            self._set_indexed(self.count)
+
+    def _index_message(self, i, text):
+        terms = set(canonical_key(text).split())
+        self.db.executemany("INSERT INTO postings VALUES (?, ?)", ((term, i) for term in terms))
+
+    def _set_indexed(self, count):
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('indexed', ?)", (count,))
+
+    def __len__(self):
+        return self.count
+
+    # اضافه کردن یک پیام؛ اندیس آن برگردانده می‌شود
+    def append(self, text, role, **extra):
+        record = {'time': time.time(), 'role': role, 'text': text, **extra}
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+        with self.lock:
+            offset = self._log.tell()
+            self._log.write(line)
+            self._log.flush()
+            self._index.write(offset.to_bytes(8, 'little'))
+            self._index.flush()
+            i = self.count
+            self.count += 1
+
+            page = self.pages.get(i // self.page_size)
+            if page is not None:
+                page.append(record)
+            with self.db:
+                self._index_message(i, text)
+                self._set_indexed(self.count)
+        return i
+
+    # پیام i ام (از کش صفحه‌ها یا از دیسک)
+    def get(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError("transcript index out of range")
+        number = i // self.page_size
+        with self.lock:
+            page = self.pages.get(number)
+            if page is None:
+                page = self._read_page(number)
+                self.pages[number] = page
+                while len(self.pages) > self.max_pages:
+                    self.pages.popitem(last=False)
+            else:
+                self.pages.move_to_end(number)
+            return page[i - number * self.page_size]
+
+    def _read_page(self, number):
+        start = number * self.page_size
+        stop = min(self.count, start + self.page_size)
+        self._index_reader.seek(start * 8)
+        offset = int.from_bytes(self._index_reader.read(8), 'little')
+        self._reader.seek(offset)
+        return [json.loads(self._reader.readline()) for _ in range(start, stop)]
+
+    # اندیس پیام‌هایی که همه کلمات query را دارند، از جدیدترین به قدیمی‌ترین
+    def search(self, query, limit=50):
+        terms = sorted(set(canonical_key(query).split()))
+        if not terms:
+            return []
+        placeholders = ",".join("?" * len(terms))
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT message FROM postings WHERE term IN ({placeholders}) "
+                "GROUP BY message HAVING COUNT(DISTINCT term) = ? "
+                "ORDER BY message DESC LIMIT ?",
+                (*terms, len(terms), limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self.lock:
+            for f in (self._log, self._index, self._reader, self._index_reader):
+                f.close()
+            self.db.close()